@@ -22,13 +22,15 @@ except ImportError:
 warnings.filterwarnings('ignore')
 
 # Import the main analyzer class
-from gamma_exposure_analyzer import GammaExposureAnalyzer
+from gamma_exposure_analyzer import GammaExposureAnalyzer, _black_scholes_greeks_arrays
 
 class AdvancedGammaAnalysis:
     """
     Advanced utilities for gamma exposure analysis
     """
     
+    __slots__ = ('analyzer', 'symbol')
+    
     def __init__(self, analyzer):
         self.analyzer = analyzer
         self.symbol = analyzer.symbol
@@ -67,13 +69,10 @@ class AdvancedGammaAnalysis:
         data = self.analyzer.gamma_exposure_data
         current_price = self.analyzer.current_price
         
-        # Separate calls and puts
-        calls = data[data['type'] == 'call']
-        puts = data[data['type'] == 'put']
-        
-        # Calculate dealer exposure by option type
-        call_gamma_exposure = calls['gamma_exposure'].sum()
-        put_gamma_exposure = puts['gamma_exposure'].sum()
+        # Calculate dealer exposure by option type (one grouped sum instead of a filter per type)
+        gamma_by_type = data.groupby('type')['gamma_exposure'].sum()
+        call_gamma_exposure = gamma_by_type.get('call', 0.0)
+        put_gamma_exposure = gamma_by_type.get('put', 0.0)
         
         # ATM analysis (within 2% of current price)
         atm_range = current_price * 0.02
@@ -82,8 +81,9 @@ class AdvancedGammaAnalysis:
             (data['strike'] <= current_price + atm_range)
         ]
         
-        atm_call_gamma = atm_options[atm_options['type'] == 'call']['gamma_exposure'].sum()
-        atm_put_gamma = atm_options[atm_options['type'] == 'put']['gamma_exposure'].sum()
+        atm_gamma_by_type = atm_options.groupby('type')['gamma_exposure'].sum()
+        atm_call_gamma = atm_gamma_by_type.get('call', 0.0)
+        atm_put_gamma = atm_gamma_by_type.get('put', 0.0)
         
         # Calculate put/call ratio by gamma exposure
         pc_ratio_gamma = abs(put_gamma_exposure) / abs(call_gamma_exposure) if call_gamma_exposure != 0 else 0
@@ -112,32 +112,22 @@ class AdvancedGammaAnalysis:
         threshold_high = gamma_by_strike['abs_gamma_exposure'].quantile(0.8)
         threshold_medium = gamma_by_strike['abs_gamma_exposure'].quantile(0.6)
         
-        zones = []
-        
-        for _, row in gamma_by_strike.iterrows():
-            strike = row['strike']
-            gamma_exp = row['gamma_exposure']
-            abs_gamma_exp = row['abs_gamma_exposure']
-            
-            if abs_gamma_exp >= threshold_high:
-                intensity = "High"
-            elif abs_gamma_exp >= threshold_medium:
-                intensity = "Medium"
-            else:
-                intensity = "Low"
-            
-            zone_type = "Support/Resistance" if gamma_exp > 0 else "Volatility Zone"
-            
-            zones.append({
-                'strike': strike,
-                'gamma_exposure': gamma_exp,
-                'intensity': intensity,
-                'zone_type': zone_type,
-                'distance_from_spot': abs(strike - current_price),
-                'distance_pct': abs(strike - current_price) / current_price * 100
-            })
-        
-        return pd.DataFrame(zones).sort_values('distance_from_spot')
+        strikes = gamma_by_strike['strike'].to_numpy()
+        gamma_exp = gamma_by_strike['gamma_exposure'].to_numpy()
+        abs_gamma_exp = gamma_by_strike['abs_gamma_exposure'].to_numpy()
+        distance = np.abs(strikes - current_price)
+        
+        zones = pd.DataFrame({
+            'strike': strikes,
+            'gamma_exposure': gamma_exp,
+            'intensity': np.select([abs_gamma_exp >= threshold_high, abs_gamma_exp >= threshold_medium],
+                                   ['High', 'Medium'], 'Low'),
+            'zone_type': np.where(gamma_exp > 0, 'Support/Resistance', 'Volatility Zone'),
+            'distance_from_spot': distance,
+            'distance_pct': distance / current_price * 100
+        })
+        
+        return zones.sort_values('distance_from_spot')
     
     def create_interactive_gamma_chart(self):
         """
@@ -163,8 +153,8 @@ class AdvancedGammaAnalysis:
         )
         
         # Colors based on positive/negative
-        colors = ['green' if x > 0 else 'red' for x in gamma_by_strike['gamma_exposure']]
-        vanna_colors = ['blue' if x > 0 else 'orange' for x in gamma_by_strike['vanna_exposure']]
+        colors = np.where(gamma_by_strike['gamma_exposure'].to_numpy() > 0, 'green', 'red')
+        vanna_colors = np.where(gamma_by_strike['vanna_exposure'].to_numpy() > 0, 'blue', 'orange')
         
         # Gamma exposure bars
         fig.add_trace(
@@ -173,6 +163,7 @@ class AdvancedGammaAnalysis:
                 y=gamma_by_strike['gamma_exposure'],
                 name='Gamma Exposure',
                 marker_color=colors,
+                marker_line_width=0,
                 hovertemplate='Strike: $%{x}<br>Gamma Exposure: $%{y:,.0f}<extra></extra>'
             ),
             row=1, col=1
@@ -185,6 +176,7 @@ class AdvancedGammaAnalysis:
                 y=gamma_by_strike['vanna_exposure'],
                 name='Vanna Exposure',
                 marker_color=vanna_colors,
+                marker_line_width=0,
                 hovertemplate='Strike: $%{x}<br>Vanna Exposure: $%{y:,.0f}<extra></extra>'
             ),
             row=2, col=1
@@ -215,7 +207,8 @@ class AdvancedGammaAnalysis:
         fig.update_layout(
             title=f'{self.symbol} Interactive Gamma & Vanna Exposure',
             height=800,
-            showlegend=True
+            showlegend=True,
+            uirevision=self.symbol
         )
         
         fig.update_xaxes(title_text="Strike Price", row=2, col=1)
@@ -232,39 +225,30 @@ class AdvancedGammaAnalysis:
         if self.analyzer.gamma_exposure_data is None:
             return None
         
+        data = self.analyzer.gamma_exposure_data
         current_price = self.analyzer.current_price
-        scenarios = []
+        new_prices = current_price * (1 + np.asarray(price_moves, dtype=np.float64))
+        
+        # Reprice every contract at every scenario price in one broadcast (scenarios x contracts)
+        is_call = (data['type'] == 'call').to_numpy()
+        _, gamma, _, _ = _black_scholes_greeks_arrays(
+            S=new_prices[:, np.newaxis],
+            K=data['strike'].to_numpy(dtype=np.float64),
+            T=data['days_to_expiration'].to_numpy(dtype=np.float64) / 365.0,
+            r=self.analyzer.risk_free_rate,
+            sigma=data['implied_volatility'].to_numpy(dtype=np.float64),
+            is_call=is_call
+        )
         
-        for move in price_moves:
-            new_price = current_price * (1 + move)
-            
-            # Recalculate gamma exposure at new price
-            scenario_gamma = 0
-            for _, option in self.analyzer.gamma_exposure_data.iterrows():
-                greeks = self.analyzer.black_scholes_greeks(
-                    S=new_price,
-                    K=option['strike'],
-                    T=option['time_to_expiration'],
-                    r=self.analyzer.risk_free_rate,
-                    sigma=option['implied_volatility'],
-                    option_type=option['type']
-                )
-                
-                # Calculate dealer gamma exposure at new price
-                if option['type'] == 'call':
-                    dealer_gamma = -option['open_interest'] * greeks['gamma'] * 100 * new_price ** 2 * 0.01
-                else:
-                    dealer_gamma = option['open_interest'] * greeks['gamma'] * 100 * new_price ** 2 * 0.01
-                
-                scenario_gamma += dealer_gamma
-            
-            scenarios.append({
-                'price_move_pct': move * 100,
-                'new_price': new_price,
-                'net_gamma_exposure': scenario_gamma
-            })
+        # Dealer gamma exposure at each new price (dealers short calls, long puts)
+        dealer_open_interest = np.where(is_call, -1.0, 1.0) * data['open_interest'].to_numpy(dtype=np.float64)
+        net_gamma_exposure = (gamma @ dealer_open_interest) * 100 * new_prices ** 2 * 0.01
         
-        return pd.DataFrame(scenarios)
+        return pd.DataFrame({
+            'price_move_pct': np.asarray(price_moves, dtype=np.float64) * 100,
+            'new_price': new_prices,
+            'net_gamma_exposure': net_gamma_exposure
+        })
     
     def analyze_expiration_impact(self):
         """
@@ -322,7 +306,7 @@ class AdvancedGammaAnalysis:
         # 1. Gamma Profile
         gamma_by_strike = self.analyzer.aggregate_gamma_by_strike()
         if gamma_by_strike is not None:
-            colors = ['green' if x > 0 else 'red' for x in gamma_by_strike['gamma_exposure']]
+            colors = np.where(gamma_by_strike['gamma_exposure'].to_numpy() > 0, 'green', 'red')
             ax1.bar(gamma_by_strike['strike'], gamma_by_strike['gamma_exposure'], color=colors, alpha=0.7)
             ax1.axvline(x=self.analyzer.current_price, color='black', linestyle='--', linewidth=2)
             ax1.set_title('Gamma Exposure Profile')
@@ -332,7 +316,7 @@ class AdvancedGammaAnalysis:
         
         # 2. Vanna Profile
         if gamma_by_strike is not None:
-            vanna_colors = ['blue' if x > 0 else 'orange' for x in gamma_by_strike['vanna_exposure']]
+            vanna_colors = np.where(gamma_by_strike['vanna_exposure'].to_numpy() > 0, 'blue', 'orange')
             ax2.bar(gamma_by_strike['strike'], gamma_by_strike['vanna_exposure'], color=vanna_colors, alpha=0.7)
             ax2.axvline(x=self.analyzer.current_price, color='black', linestyle='--', linewidth=2)
             ax2.set_title('Vanna Exposure Profile')
@@ -353,7 +337,7 @@ class AdvancedGammaAnalysis:
         exp_analysis = self.analyze_expiration_impact()
         if exp_analysis is not None:
             ax4.bar(range(len(exp_analysis)), exp_analysis['gamma_exposure'], 
-                   color=['red' if x < 0 else 'green' for x in exp_analysis['gamma_exposure']], alpha=0.7)
+                   color=np.where(exp_analysis['gamma_exposure'].to_numpy() < 0, 'red', 'green'), alpha=0.7)
             ax4.set_title('Gamma Exposure by Expiration')
             ax4.set_xlabel('Expiration (Days to Exp)')
             ax4.set_ylabel('Gamma Exposure ($)')
@@ -366,6 +350,35 @@ class AdvancedGammaAnalysis:
         plt.tight_layout()
         plt.show()
 
+def fetch_spot_prices(symbols_list):
+    """
+    Fetch the latest close for several symbols in one batched yfinance request
+    Returns a dict of symbol -> price; symbols without data are left out
+    """
+    symbols = [symbol.upper() for symbol in symbols_list]
+    
+    try:
+        prices = yf.download(' '.join(symbols), period='1d', group_by='ticker',
+                             threads=True, progress=False)
+    except Exception as e:
+        print(f"Batch price download failed: {e}")
+        return {}
+    
+    spot_prices = {}
+    for symbol in symbols:
+        try:
+            if isinstance(prices.columns, pd.MultiIndex):
+                closes = prices[symbol]['Close'].dropna()
+            else:
+                closes = prices['Close'].dropna()
+        except KeyError:
+            continue
+        
+        if len(closes) > 0:
+            spot_prices[symbol] = float(closes.iloc[-1])
+    
+    return spot_prices
+
 def create_gamma_scanner(symbols_list):
     """
     Scan multiple symbols for gamma exposure analysis
@@ -375,10 +388,13 @@ def create_gamma_scanner(symbols_list):
     print("Starting Gamma Scanner...")
     print("=" * 50)
     
+    # One batched request for all spot prices instead of one per symbol
+    spot_prices = fetch_spot_prices(symbols_list)
+    
     for symbol in symbols_list:
         try:
             print(f"\nScanning {symbol}...")
-            analyzer = GammaExposureAnalyzer(symbol)
+            analyzer = GammaExposureAnalyzer(symbol, spot_price=spot_prices.get(symbol.upper()))
             
             # Quick analysis
             analyzer.get_current_price()
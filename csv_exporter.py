@@ -10,6 +10,64 @@ import os
 from gamma_exposure_analyzer import GammaExposureAnalyzer
 from advanced_analysis import AdvancedGammaAnalysis
 
+# Column layouts of the exported CSV files
+RAW_DATA_COLUMNS = [
+    'symbol', 'analysis_timestamp', 'current_price',
+    'expiration', 'days_to_expiration', 'strike', 'type',
+    'gamma_exposure', 'vanna_exposure', 'open_interest',
+    'implied_volatility', 'delta', 'gamma', 'vanna',
+    'last_price', 'volume'
+]
+
+STRIKE_COLUMNS = [
+    'symbol', 'analysis_timestamp', 'current_price',
+    'strike', 'gamma_exposure', 'vanna_exposure', 'open_interest',
+    'abs_gamma_exposure', 'is_king_node',
+    'distance_from_current', 'distance_pct', 'above_below_current'
+]
+
+# Per-expiration aggregation and the flat column names it produces
+EXPIRATION_AGGREGATIONS = {
+    'gamma_exposure': ['sum', 'count', 'mean', 'std'],
+    'vanna_exposure': ['sum', 'mean'],
+    'open_interest': 'sum',
+    'days_to_expiration': 'first'
+}
+
+EXPIRATION_AGGREGATE_NAMES = [
+    'expiration',
+    'total_gamma_exposure', 'options_count', 'avg_gamma_exposure', 'std_gamma_exposure',
+    'total_vanna_exposure', 'avg_vanna_exposure',
+    'total_open_interest', 'days_to_expiration'
+]
+
+EXPIRATION_COLUMNS = [
+    'symbol', 'analysis_timestamp', 'current_price',
+    'expiration', 'days_to_expiration', 'options_count',
+    'total_gamma_exposure', 'avg_gamma_exposure', 'std_gamma_exposure',
+    'total_vanna_exposure', 'avg_vanna_exposure',
+    'total_open_interest', 'gamma_impact_score'
+]
+
+KEY_LEVEL_COLUMNS = [
+    'symbol', 'analysis_timestamp', 'current_price',
+    'level_type', 'strike', 'gamma_exposure', 'vanna_exposure', 'open_interest',
+    'distance_from_current', 'distance_pct', 'above_below'
+]
+
+# Comment header written above the exported gamma matrix
+MATRIX_HEADER_TEMPLATE = (
+    "# Gamma Exposure Matrix for {symbol}\n"
+    "# Analysis Date: {timestamp}\n"
+    "# Current Price: ${current_price:.2f}\n"
+    "# Values in USD (Gamma Exposure)\n"
+    "# Rows: Strike Prices\n"
+    "# Columns: Expiration Dates\n"
+    "# Matrix Size: {strikes} strikes × {expirations} expirations\n"
+    "# Non-zero values: {non_zero}\n"
+    "#\n"
+)
+
 class GammaExposureCSVExporter:
     """
     Export gamma exposure data to CSV files in various formats
@@ -18,7 +76,9 @@ class GammaExposureCSVExporter:
     def __init__(self, analyzer):
         self.analyzer = analyzer
         self.symbol = analyzer.symbol
-        self.export_dir = f"gamma_exports_{self.symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # One timestamp per export run, shared by the directory name and every file
+        self.analysis_timestamp = datetime.now()
+        self.export_dir = f"gamma_exports_{self.symbol}_{self.analysis_timestamp.strftime('%Y%m%d_%H%M%S')}"
         
     def create_export_directory(self):
         """Create directory for exports"""
@@ -45,24 +105,15 @@ class GammaExposureCSVExporter:
         
         # Add current price and timestamp
         export_data['current_price'] = self.analyzer.current_price
-        export_data['analysis_timestamp'] = datetime.now()
+        export_data['analysis_timestamp'] = self.analysis_timestamp
         export_data['symbol'] = self.symbol
         
-        # Reorder columns for better readability
-        column_order = [
-            'symbol', 'analysis_timestamp', 'current_price',
-            'expiration', 'days_to_expiration', 'strike', 'type',
-            'gamma_exposure', 'vanna_exposure', 'open_interest',
-            'implied_volatility', 'delta', 'gamma', 'vanna',
-            'last_price', 'volume'
-        ]
-        
-        # Ensure all columns exist
-        for col in column_order:
+        # Ensure all columns exist, then reorder for better readability
+        for col in RAW_DATA_COLUMNS:
             if col not in export_data.columns:
                 export_data[col] = None
         
-        export_data = export_data[column_order]
+        export_data = export_data[RAW_DATA_COLUMNS]
         
         # Export to CSV
         export_data.to_csv(filepath, index=False)
@@ -102,18 +153,20 @@ class GammaExposureCSVExporter:
         
         # Add metadata as header comments
         with open(filepath, 'w') as f:
-            f.write(f"# Gamma Exposure Matrix for {self.symbol}\n")
-            f.write(f"# Analysis Date: {datetime.now()}\n")
-            f.write(f"# Current Price: ${self.analyzer.current_price:.2f}\n")
-            f.write(f"# Values in USD (Gamma Exposure)\n")
-            f.write(f"# Rows: Strike Prices\n")
-            f.write(f"# Columns: Expiration Dates\n")
-            f.write(f"# Matrix Size: {gamma_matrix.shape[0]} strikes × {gamma_matrix.shape[1]} expirations\n")
-            f.write(f"# Non-zero values: {(gamma_matrix != 0).sum().sum()}\n")
-            f.write("#\n")
-        
-        # Export matrix with header
-        gamma_matrix.to_csv(filepath, mode='a')
+            f.write(MATRIX_HEADER_TEMPLATE.format(
+                symbol=self.symbol,
+                timestamp=self.analysis_timestamp,
+                current_price=self.analyzer.current_price,
+                strikes=gamma_matrix.shape[0],
+                expirations=gamma_matrix.shape[1],
+                non_zero=(gamma_matrix != 0).sum().sum()
+            ))
+        
+        # Export matrix with header (a MultiIndex is flattened to columns first; its to_csv path is slow)
+        if isinstance(gamma_matrix.index, pd.MultiIndex):
+            gamma_matrix.reset_index().to_csv(filepath, mode='a', index=False)
+        else:
+            gamma_matrix.to_csv(filepath, mode='a')
         print(f"✅ Gamma matrix exported to: {filepath}")
         print(f"   Dimensions: {gamma_matrix.shape[0]} strikes × {gamma_matrix.shape[1]} expirations")
         
@@ -137,7 +190,7 @@ class GammaExposureCSVExporter:
         export_data = gamma_by_strike.copy()
         export_data['symbol'] = self.symbol
         export_data['current_price'] = self.analyzer.current_price
-        export_data['analysis_timestamp'] = datetime.now()
+        export_data['analysis_timestamp'] = self.analysis_timestamp
         
         # Calculate additional metrics
         export_data['distance_from_current'] = abs(export_data['strike'] - self.analyzer.current_price)
@@ -147,14 +200,7 @@ class GammaExposureCSVExporter:
         )
         
         # Reorder columns
-        column_order = [
-            'symbol', 'analysis_timestamp', 'current_price',
-            'strike', 'gamma_exposure', 'vanna_exposure', 'open_interest',
-            'abs_gamma_exposure', 'is_king_node',
-            'distance_from_current', 'distance_pct', 'above_below_current'
-        ]
-        
-        export_data = export_data[column_order]
+        export_data = export_data[STRIKE_COLUMNS]
         export_data = export_data.sort_values('strike')
         
         # Export to CSV
@@ -178,23 +224,15 @@ class GammaExposureCSVExporter:
         filepath = os.path.join(self.export_dir, filename)
         
         # Aggregate by expiration
-        gamma_by_exp = self.analyzer.gamma_exposure_data.groupby('expiration').agg({
-            'gamma_exposure': ['sum', 'count', 'mean', 'std'],
-            'vanna_exposure': ['sum', 'mean'],
-            'open_interest': 'sum',
-            'days_to_expiration': 'first'
-        }).reset_index()
+        gamma_by_exp = self.analyzer.gamma_exposure_data.groupby('expiration').agg(EXPIRATION_AGGREGATIONS).reset_index()
         
         # Flatten column names
-        gamma_by_exp.columns = ['expiration', 
-                               'total_gamma_exposure', 'options_count', 'avg_gamma_exposure', 'std_gamma_exposure',
-                               'total_vanna_exposure', 'avg_vanna_exposure',
-                               'total_open_interest', 'days_to_expiration']
+        gamma_by_exp.columns = EXPIRATION_AGGREGATE_NAMES
         
         # Add metadata
         gamma_by_exp['symbol'] = self.symbol
         gamma_by_exp['current_price'] = self.analyzer.current_price
-        gamma_by_exp['analysis_timestamp'] = datetime.now()
+        gamma_by_exp['analysis_timestamp'] = self.analysis_timestamp
         
         # Calculate gamma impact score (gamma exposure / days to expiry)
         gamma_by_exp['gamma_impact_score'] = abs(gamma_by_exp['total_gamma_exposure']) / gamma_by_exp['days_to_expiration'].replace(0, 1)
@@ -203,15 +241,7 @@ class GammaExposureCSVExporter:
         gamma_by_exp = gamma_by_exp.sort_values('days_to_expiration')
         
         # Reorder columns
-        column_order = [
-            'symbol', 'analysis_timestamp', 'current_price',
-            'expiration', 'days_to_expiration', 'options_count',
-            'total_gamma_exposure', 'avg_gamma_exposure', 'std_gamma_exposure',
-            'total_vanna_exposure', 'avg_vanna_exposure',
-            'total_open_interest', 'gamma_impact_score'
-        ]
-        
-        gamma_by_exp = gamma_by_exp[column_order]
+        gamma_by_exp = gamma_by_exp[EXPIRATION_COLUMNS]
         
         # Export to CSV
         gamma_by_exp.to_csv(filepath, index=False)
@@ -234,79 +264,44 @@ class GammaExposureCSVExporter:
         
         filepath = os.path.join(self.export_dir, filename)
         
-        # Prepare key levels data
-        key_levels_data = []
+        current_price = self.analyzer.current_price
         
-        # King node
+        # King node, then the top 5 resistance and support strikes
+        level_types, level_strikes = [], []
         if levels['king_node'] is not None:
-            king_data = levels['king_node'].copy()
-            key_levels_data.append({
-                'level_type': 'King Node',
-                'strike': king_data['strike'],
-                'gamma_exposure': king_data['gamma_exposure'],
-                'vanna_exposure': king_data.get('vanna_exposure', 0),
-                'open_interest': king_data.get('open_interest', 0),
-                'distance_from_current': abs(king_data['strike'] - self.analyzer.current_price),
-                'distance_pct': abs(king_data['strike'] - self.analyzer.current_price) / self.analyzer.current_price * 100,
-                'above_below': 'Above' if king_data['strike'] > self.analyzer.current_price else 'Below'
-            })
-        
-        # Resistance levels
-        for i, strike in enumerate(levels['resistance_levels'][:5]):  # Top 5
-            gamma_data = self.analyzer.aggregate_gamma_by_strike()
-            if gamma_data is not None:
-                strike_data = gamma_data[gamma_data['strike'] == strike]
-                if len(strike_data) > 0:
-                    row = strike_data.iloc[0]
-                    key_levels_data.append({
-                        'level_type': f'Resistance_{i+1}',
-                        'strike': strike,
-                        'gamma_exposure': row['gamma_exposure'],
-                        'vanna_exposure': row.get('vanna_exposure', 0),
-                        'open_interest': row.get('open_interest', 0),
-                        'distance_from_current': abs(strike - self.analyzer.current_price),
-                        'distance_pct': abs(strike - self.analyzer.current_price) / self.analyzer.current_price * 100,
-                        'above_below': 'Above'
-                    })
-        
-        # Support levels
-        for i, strike in enumerate(levels['support_levels'][:5]):  # Top 5
-            gamma_data = self.analyzer.aggregate_gamma_by_strike()
-            if gamma_data is not None:
-                strike_data = gamma_data[gamma_data['strike'] == strike]
-                if len(strike_data) > 0:
-                    row = strike_data.iloc[0]
-                    key_levels_data.append({
-                        'level_type': f'Support_{i+1}',
-                        'strike': strike,
-                        'gamma_exposure': row['gamma_exposure'],
-                        'vanna_exposure': row.get('vanna_exposure', 0),
-                        'open_interest': row.get('open_interest', 0),
-                        'distance_from_current': abs(strike - self.analyzer.current_price),
-                        'distance_pct': abs(strike - self.analyzer.current_price) / self.analyzer.current_price * 100,
-                        'above_below': 'Below'
-                    })
-        
-        if not key_levels_data:
+            level_types.append('King Node')
+            level_strikes.append(levels['king_node']['strike'])
+        for prefix, strikes in (('Resistance', levels['resistance_levels'][:5]),
+                                ('Support', levels['support_levels'][:5])):
+            level_types.extend(f'{prefix}_{i+1}' for i in range(len(strikes)))
+            level_strikes.extend(strikes)
+        
+        if not level_strikes:
             print("❌ No key levels found.")
             return None
         
-        # Create DataFrame
-        key_levels_df = pd.DataFrame(key_levels_data)
+        # Look up every level in one aggregation and build the frame column-wise
+        strike_data = self.analyzer.aggregate_gamma_by_strike().set_index('strike').loc[level_strikes]
+        strikes = np.asarray(level_strikes, dtype=np.float64)
+        distance = np.abs(strikes - current_price)
+        key_levels_df = pd.DataFrame({
+            'level_type': level_types,
+            'strike': strikes,
+            'gamma_exposure': strike_data['gamma_exposure'].to_numpy(),
+            'vanna_exposure': strike_data['vanna_exposure'].to_numpy(),
+            'open_interest': strike_data['open_interest'].to_numpy(),
+            'distance_from_current': distance,
+            'distance_pct': distance / current_price * 100,
+            'above_below': np.where(strikes > current_price, 'Above', 'Below')
+        })
         
         # Add metadata
         key_levels_df['symbol'] = self.symbol
         key_levels_df['current_price'] = self.analyzer.current_price
-        key_levels_df['analysis_timestamp'] = datetime.now()
+        key_levels_df['analysis_timestamp'] = self.analysis_timestamp
         
         # Reorder columns
-        column_order = [
-            'symbol', 'analysis_timestamp', 'current_price',
-            'level_type', 'strike', 'gamma_exposure', 'vanna_exposure', 'open_interest',
-            'distance_from_current', 'distance_pct', 'above_below'
-        ]
-        
-        key_levels_df = key_levels_df[column_order]
+        key_levels_df = key_levels_df[KEY_LEVEL_COLUMNS]
         key_levels_df = key_levels_df.sort_values('distance_from_current')
         
         # Export to CSV
@@ -333,7 +328,7 @@ class GammaExposureCSVExporter:
         # Create summary data
         summary_data = [{
             'symbol': self.symbol,
-            'analysis_timestamp': datetime.now(),
+            'analysis_timestamp': self.analysis_timestamp,
             'current_price': self.analyzer.current_price,
             'market_regime': sentiment['regime'],
             'regime_color': sentiment['color'],
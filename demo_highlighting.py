@@ -28,19 +28,22 @@ def demo_highlighting():
     print("\nHighlighting Analysis:")
     print("=" * 60)
     
-    for col in df.columns:
-        col_data = df[col]
-        non_zero_data = col_data[col_data != 0]
+    # Column-wise reductions over the whole matrix instead of a per-expiration loop
+    non_zero = df.where(df != 0)
+    has_data = non_zero.notna().any()
+    max_vals = non_zero.max()
+    min_vals = non_zero.min()
+    max_strikes = df.idxmax()
+    min_strikes = df.idxmin()
+    
+    for col in df.columns[has_data.to_numpy()]:
+        # where() promotes to float, so cast back to the column's own dtype for printing
+        max_val = df.dtypes[col].type(max_vals[col])
+        min_val = df.dtypes[col].type(min_vals[col])
         
-        if len(non_zero_data) > 0:
-            max_val = non_zero_data.max()
-            min_val = non_zero_data.min()
-            max_strike = col_data.idxmax()
-            min_strike = col_data.idxmin()
-            
-            print(f"\n{col}:")
-            print(f"  🟢 Highest Positive: ${max_val:,} at strike ${max_strike}")
-            print(f"  🔴 Highest Negative: ${min_val:,} at strike ${min_strike}")
+        print(f"\n{col}:")
+        print(f"  🟢 Highest Positive: ${max_val:,} at strike ${max_strikes[col]}")
+        print(f"  🔴 Highest Negative: ${min_val:,} at strike ${min_strikes[col]}")
 
 if __name__ == "__main__":
     demo_highlighting()
\ No newline at end of file
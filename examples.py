@@ -210,7 +210,7 @@ def educational_example():
     print(f"3️⃣ Fetching options data for {symbol}")
     options_data = analyzer.get_options_data()
     if options_data:
-        total_options = sum(len(df) for df in options_data.values())
+        total_options = analyzer.total_options()
         print(f"   Total options contracts: {total_options}")
         print(f"   Expiration dates: {list(options_data.keys())}")
     
@@ -9,17 +9,63 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
+from functools import lru_cache
+import time
 import warnings
 from scipy import stats
+from scipy.special import ndtr
 
 warnings.filterwarnings('ignore')
 
+# 1 / sqrt(2 * pi), used for the closed-form standard normal pdf
+_INV_SQRT_2PI = 0.3989422804014327
+
+# Seconds a fetched spot price is reused before hitting yfinance again
+PRICE_CACHE_TTL = 60
+
+# Option type stored as a two-value categorical (int8 codes instead of per-row strings)
+OPTION_TYPE_DTYPE = pd.CategoricalDtype(['call', 'put'])
+
+@lru_cache(maxsize=1024)
+def _parse_expiration(exp_date):
+    """Parse a yfinance expiration string ('YYYY-MM-DD') into a date"""
+    return datetime.strptime(exp_date, '%Y-%m-%d').date()
+
+def _black_scholes_greeks_arrays(S, K, T, r, sigma, is_call):
+    """
+    Vectorized Black-Scholes Greeks over arrays of contracts
+    Contracts with T <= 0 or sigma <= 0 get zero Greeks, like black_scholes_greeks
+    Returns (delta, gamma, vanna, charm) in the floating dtype of the inputs
+    With float32 inputs the results differ from float64 by up to ~1.5e-5 relative
+    for gamma and ~4e-4 / ~2e-4 for vanna / charm (cancellation in d2 near the money)
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        sqrt_T = np.sqrt(T)
+        sigma_sqrt_T = sigma * sqrt_T
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+        pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+        
+        delta = ndtr(d1)
+        delta = np.where(is_call, delta, delta - 1)
+        gamma = pdf_d1 / (S * sigma_sqrt_T)
+        vanna = -pdf_d1 * d2 / sigma
+        charm = -pdf_d1 * (2 * r * T - d2 * sigma_sqrt_T) / (2 * T * sigma_sqrt_T)
+    
+    valid = (T > 0) & (sigma > 0)
+    return tuple(np.where(valid, greek, 0).astype(d1.dtype, copy=False)
+                 for greek in (delta, gamma, vanna, charm))
+
 class GammaExposureAnalyzer:
     """
     Main class for analyzing gamma exposure using options data from yfinance
     """
     
-    def __init__(self, symbol, risk_free_rate=0.05):
+    __slots__ = ('symbol', 'risk_free_rate', 'ticker', 'current_price', 'options_data',
+                 'gamma_exposure_data', 'vanna_exposure_data', '_price_expiry', '_total_options',
+                 '_strike_cache')
+    
+    def __init__(self, symbol, risk_free_rate=0.05, spot_price=None):
         self.symbol = symbol.upper()
         self.risk_free_rate = risk_free_rate
         self.ticker = yf.Ticker(symbol)
@@ -27,9 +73,21 @@ class GammaExposureAnalyzer:
         self.options_data = {}
         self.gamma_exposure_data = None
         self.vanna_exposure_data = None
+        self._price_expiry = 0.0
+        self._total_options = 0
+        self._strike_cache = None
+        
+        # A prefetched price (e.g. from a batch download) skips the first price lookup
+        if spot_price is not None:
+            self.current_price = spot_price
+            self._price_expiry = time.time() + PRICE_CACHE_TTL
         
     def get_current_price(self):
-        """Get current stock price"""
+        """Get current stock price (reused for PRICE_CACHE_TTL seconds)"""
+        now = time.time()
+        if self.current_price is not None and now < self._price_expiry:
+            return self.current_price
+        
         try:
             info = self.ticker.info
             self.current_price = info.get('currentPrice', info.get('regularMarketPrice'))
@@ -37,6 +95,7 @@ class GammaExposureAnalyzer:
                 # Fallback to recent price data
                 hist = self.ticker.history(period="1d")
                 self.current_price = hist['Close'].iloc[-1]
+            self._price_expiry = now + PRICE_CACHE_TTL
             return self.current_price
         except Exception as e:
             print(f"Error getting current price: {e}")
@@ -48,10 +107,13 @@ class GammaExposureAnalyzer:
             # Get all expiration dates
             expirations = self.ticker.options
             self.options_data = {}
+            self._total_options = 0
             
             print(f"Fetching options data for {self.symbol}...")
             print(f"Found {len(expirations)} expiration dates")
             
+            today = datetime.now().date()
+            
             for exp_date in expirations:
                 try:
                     option_chain = self.ticker.option_chain(exp_date)
@@ -68,15 +130,15 @@ class GammaExposureAnalyzer:
                     
                     # Combine calls and puts
                     all_options = pd.concat([calls, puts], ignore_index=True)
+                    all_options['type'] = all_options['type'].astype(OPTION_TYPE_DTYPE)
                     
                     # Calculate days to expiration
-                    exp_datetime = pd.to_datetime(exp_date)
-                    current_datetime = pd.to_datetime(datetime.now().date())
-                    days_to_exp = (exp_datetime - current_datetime).days
+                    days_to_exp = (_parse_expiration(exp_date) - today).days
                     all_options['days_to_expiration'] = days_to_exp
                     all_options['time_to_expiration'] = days_to_exp / 365.0
                     
                     self.options_data[exp_date] = all_options
+                    self._total_options += len(all_options)
                     print(f"Processed {exp_date}: {len(all_options)} options")
                     
                 except Exception as e:
@@ -89,6 +151,10 @@ class GammaExposureAnalyzer:
             print(f"Error fetching options data: {e}")
             return None
     
+    def total_options(self):
+        """Number of option contracts fetched by the last get_options_data() call"""
+        return self._total_options
+    
     def black_scholes_greeks(self, S, K, T, r, sigma, option_type='call'):
         """
         Calculate Black-Scholes Greeks
@@ -102,19 +168,22 @@ class GammaExposureAnalyzer:
             return {'delta': 0, 'gamma': 0, 'vanna': 0, 'charm': 0}
         
         try:
-            d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-            d2 = d1 - sigma * np.sqrt(T)
+            sqrt_T = np.sqrt(T)
+            d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+            d2 = d1 - sigma * sqrt_T
+            
+            # Standard normal pdf in closed form (avoids scipy's rv_continuous dispatch)
+            pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
             
             # Calculate Greeks
             if option_type == 'call':
                 delta = stats.norm.cdf(d1)
-                charm = -stats.norm.pdf(d1) * (2 * r * T - d2 * sigma * np.sqrt(T)) / (2 * T * sigma * np.sqrt(T))
             else:  # put
                 delta = stats.norm.cdf(d1) - 1
-                charm = -stats.norm.pdf(d1) * (2 * r * T - d2 * sigma * np.sqrt(T)) / (2 * T * sigma * np.sqrt(T))
+            charm = -pdf_d1 * (2 * r * T - d2 * sigma * sqrt_T) / (2 * T * sigma * sqrt_T)
             
-            gamma = stats.norm.pdf(d1) / (S * sigma * np.sqrt(T))
-            vanna = -stats.norm.pdf(d1) * d2 / sigma
+            gamma = pdf_d1 / (S * sigma * sqrt_T)
+            vanna = -pdf_d1 * d2 / sigma
             
             return {'delta': delta, 'gamma': gamma, 'vanna': vanna, 'charm': charm}
             
@@ -131,81 +200,75 @@ class GammaExposureAnalyzer:
             print("No options data or current price available")
             return None
         
-        gamma_exposure_list = []
+        # Greeks are computed in single precision (see _black_scholes_greeks_arrays for
+        # the tolerance); only the dollar exposures, which get summed downstream, are float64
+        spot = np.float32(self.current_price)
+        rate = np.float32(self.risk_free_rate)
+        gamma_notional = 100 * float(self.current_price) ** 2 * 0.01
+        greek_notional = 100 * float(self.current_price) * 0.01
+        
+        exposure_frames = []
         total_options_processed = 0
         valid_options_count = 0
         
         for exp_date, options_df in self.options_data.items():
-            exp_options_processed = 0
-            exp_valid_options = 0
+            exp_options_processed = len(options_df)
+            total_options_processed += exp_options_processed
             
-            for _, option in options_df.iterrows():
-                total_options_processed += 1
-                exp_options_processed += 1
-                
-                try:
-                    # Skip options with missing data
-                    if pd.isna(option['openInterest']) or pd.isna(option['impliedVolatility']):
-                        continue
-                    
-                    if option['openInterest'] == 0:
-                        continue
-                    
-                    if option['impliedVolatility'] <= 0:
-                        continue
-                    
-                    # Calculate Greeks
-                    greeks = self.black_scholes_greeks(
-                        S=self.current_price,
-                        K=option['strike'],
-                        T=option['time_to_expiration'],
-                        r=self.risk_free_rate,
-                        sigma=option['impliedVolatility'],
-                        option_type=option['type']
-                    )
-                    
-                    # Calculate dealer gamma exposure
-                    # Dealers are short gamma when they sell options
-                    # For calls: negative gamma exposure (dealers short)
-                    # For puts: positive gamma exposure (dealers long puts to hedge)
-                    if option['type'] == 'call':
-                        dealer_gamma_exposure = -option['openInterest'] * greeks['gamma'] * 100 * self.current_price ** 2 * 0.01
-                    else:  # puts
-                        dealer_gamma_exposure = option['openInterest'] * greeks['gamma'] * 100 * self.current_price ** 2 * 0.01
-                    
-                    # Calculate vanna exposure
-                    dealer_vanna_exposure = -option['openInterest'] * greeks['vanna'] * 100 * self.current_price * 0.01
-                    
-                    # Calculate charm exposure
-                    dealer_charm_exposure = -option['openInterest'] * greeks['charm'] * 100 * self.current_price * 0.01
-                    
-                    gamma_exposure_list.append({
-                        'expiration': exp_date,
-                        'days_to_expiration': option['days_to_expiration'],
-                        'strike': option['strike'],
-                        'type': option['type'],
-                        'open_interest': option['openInterest'],
-                        'implied_volatility': option['impliedVolatility'],
-                        'delta': greeks['delta'],
-                        'gamma': greeks['gamma'],
-                        'vanna': greeks['vanna'],
-                        'charm': greeks['charm'],
-                        'gamma_exposure': dealer_gamma_exposure,
-                        'vanna_exposure': dealer_vanna_exposure,
-                        'charm_exposure': dealer_charm_exposure,
-                        'last_price': option.get('lastPrice', 0),
-                        'volume': option.get('volume', 0)
-                    })
-                    
-                    valid_options_count += 1
-                    exp_valid_options += 1
-                    
-                except Exception as e:
-                    continue
+            # Skip options with missing data, zero open interest or non-positive IV
+            open_interest = options_df['openInterest'].to_numpy(dtype=np.float64)
+            implied_vol = options_df['impliedVolatility'].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(open_interest) & (open_interest != 0) & (implied_vol > 0)
+            
+            valid_options = options_df[valid]
+            open_interest = open_interest[valid]
+            implied_vol = implied_vol[valid]
+            is_call = (valid_options['type'] == 'call').to_numpy()
+            
+            # Calculate Greeks
+            delta, gamma, vanna, charm = _black_scholes_greeks_arrays(
+                S=spot,
+                K=valid_options['strike'].to_numpy(dtype=np.float32),
+                T=valid_options['time_to_expiration'].to_numpy(dtype=np.float32),
+                r=rate,
+                sigma=implied_vol.astype(np.float32),
+                is_call=is_call
+            )
+            
+            # Calculate dealer gamma exposure
+            # Dealers are short gamma when they sell options
+            # For calls: negative gamma exposure (dealers short)
+            # For puts: positive gamma exposure (dealers long puts to hedge)
+            dealer_sign = np.where(is_call, -1.0, 1.0)
+            dealer_gamma_exposure = dealer_sign * open_interest * gamma * gamma_notional
+            
+            # Calculate vanna and charm exposure
+            dealer_vanna_exposure = -open_interest * vanna * greek_notional
+            dealer_charm_exposure = -open_interest * charm * greek_notional
+            
+            exposure_frames.append(pd.DataFrame({
+                'expiration': exp_date,
+                'days_to_expiration': valid_options['days_to_expiration'].to_numpy(dtype=np.int32),
+                'strike': valid_options['strike'],
+                'type': valid_options['type'],
+                'open_interest': open_interest,
+                'implied_volatility': implied_vol,
+                'delta': delta,
+                'gamma': gamma,
+                'vanna': vanna,
+                'charm': charm,
+                'gamma_exposure': dealer_gamma_exposure,
+                'vanna_exposure': dealer_vanna_exposure,
+                'charm_exposure': dealer_charm_exposure,
+                'last_price': np.asarray(valid_options.get('lastPrice', 0), dtype=np.float32),
+                'volume': np.asarray(valid_options.get('volume', 0), dtype=np.float32)
+            }, index=valid_options.index))
             
+            exp_valid_options = int(valid.sum())
+            valid_options_count += exp_valid_options
             print(f"   {exp_date}: {exp_valid_options}/{exp_options_processed} valid options")
         
-        self.gamma_exposure_data = pd.DataFrame(gamma_exposure_list)
+        self.gamma_exposure_data = pd.concat(exposure_frames, ignore_index=True)
         
         if len(self.gamma_exposure_data) > 0:
             total_gamma = self.gamma_exposure_data['gamma_exposure'].sum()
@@ -223,10 +286,14 @@ class GammaExposureAnalyzer:
     def aggregate_gamma_by_strike(self):
         """
         Aggregate gamma exposure by strike price across all expirations
+        Memoized on the current gamma_exposure_data frame; each call returns its own copy
         """
         if self.gamma_exposure_data is None:
             return None
         
+        if self._strike_cache is not None and self._strike_cache[0] is self.gamma_exposure_data:
+            return self._strike_cache[1].copy()
+        
         # Aggregate by strike
         gamma_by_strike = self.gamma_exposure_data.groupby('strike').agg({
             'gamma_exposure': 'sum',
@@ -237,13 +304,16 @@ class GammaExposureAnalyzer:
         # Sort by strike
         gamma_by_strike = gamma_by_strike.sort_values('strike')
         
-        # Identify king nodes (largest absolute gamma exposure)
-        gamma_by_strike['abs_gamma_exposure'] = abs(gamma_by_strike['gamma_exposure'])
-        king_node_idx = gamma_by_strike['abs_gamma_exposure'].idxmax()
-        gamma_by_strike['is_king_node'] = False
-        gamma_by_strike.loc[king_node_idx, 'is_king_node'] = True
+        # Identify king nodes (largest absolute gamma exposure); one abs/argmax over the raw array
+        abs_gamma = np.abs(gamma_by_strike['gamma_exposure'].to_numpy())
+        is_king_node = np.zeros(len(abs_gamma), dtype=bool)
+        is_king_node[abs_gamma.argmax()] = True
+        gamma_by_strike['abs_gamma_exposure'] = abs_gamma
+        gamma_by_strike['is_king_node'] = is_king_node
         
-        return gamma_by_strike
+        # The cached frame is never handed out, so callers adding columns can't corrupt later calls
+        self._strike_cache = (self.gamma_exposure_data, gamma_by_strike)
+        return gamma_by_strike.copy()
     
     def aggregate_gamma_by_expiration(self):
         """
@@ -317,6 +387,28 @@ class GammaExposureAnalyzer:
         
         return charm_matrix
 
+    def aggregate_exposures_by_expiration(self):
+        """
+        Gamma, vanna and charm matrices (strike x expiration) from a single fused pivot
+        """
+        if self.gamma_exposure_data is None:
+            return None
+        
+        exposures = ['gamma_exposure', 'vanna_exposure', 'charm_exposure']
+        pivot = self.gamma_exposure_data.pivot_table(
+            index='strike',
+            columns='expiration',
+            values=exposures,
+            aggfunc='sum',
+            fill_value=0
+        ).sort_index()
+        
+        # Same layout as the single-value aggregations: strikes ascending, expirations sorted
+        return {
+            exposure: pivot[exposure].reindex(columns=sorted(pivot[exposure].columns))
+            for exposure in exposures
+        }
+
     def identify_gamma_levels(self):
         """
         Identify key gamma levels and their characteristics
@@ -367,7 +459,7 @@ class GammaExposureAnalyzer:
             'largest_negative': largest_negative,
             'resistance_levels': resistance_levels,
             'support_levels': support_levels,
-            'king_node': gamma_by_strike[gamma_by_strike['is_king_node']].iloc[0] if len(gamma_by_strike) > 0 else None
+            'king_node': gamma_by_strike.iloc[gamma_by_strike['is_king_node'].to_numpy().argmax()] if len(gamma_by_strike) > 0 else None
         }
     
     def plot_gamma_exposure_heatmap(self):
@@ -431,7 +523,7 @@ class GammaExposureAnalyzer:
         plt.figure(figsize=(12, 8))
         
         # Create bar plot with colors based on positive/negative
-        colors = ['green' if x > 0 else 'purple' for x in gamma_by_strike['gamma_exposure']]
+        colors = np.where(gamma_by_strike['gamma_exposure'].to_numpy() > 0, 'green', 'purple')
         
         bars = plt.bar(gamma_by_strike['strike'], gamma_by_strike['gamma_exposure'], 
                       color=colors, alpha=0.7)
@@ -466,10 +558,11 @@ class GammaExposureAnalyzer:
         if gamma_by_strike is None:
             return None
         
-        # Calculate net gamma exposure
-        total_positive_gamma = gamma_by_strike[gamma_by_strike['gamma_exposure'] > 0]['gamma_exposure'].sum()
-        total_negative_gamma = gamma_by_strike[gamma_by_strike['gamma_exposure'] < 0]['gamma_exposure'].sum()
-        net_gamma = total_positive_gamma + total_negative_gamma
+        # Calculate net gamma exposure (negative side is the remainder of the net)
+        gamma_values = gamma_by_strike['gamma_exposure'].to_numpy(dtype=np.float64)
+        net_gamma = gamma_values.sum()
+        total_positive_gamma = np.where(gamma_values > 0, gamma_values, 0.0).sum()
+        total_negative_gamma = net_gamma - total_positive_gamma
         
         # Analyze gamma around current price
         price_range = self.current_price * 0.05  # 5% range around current price
@@ -491,17 +584,20 @@ class GammaExposureAnalyzer:
             regime = "Mixed Gamma Environment - Moderate Volatility Expected"
             color = "⚪"  # White
         
-        # Find gamma flip point (zero gamma level)
-        gamma_flip_candidates = []
-        for i in range(len(gamma_by_strike) - 1):
-            current_gamma = gamma_by_strike.iloc[i]['gamma_exposure']
-            next_gamma = gamma_by_strike.iloc[i + 1]['gamma_exposure']
-            
-            if (current_gamma > 0 and next_gamma < 0) or (current_gamma < 0 and next_gamma > 0):
-                gamma_flip_candidates.append({
-                    'strike': (gamma_by_strike.iloc[i]['strike'] + gamma_by_strike.iloc[i + 1]['strike']) / 2,
-                    'transition': f"{gamma_by_strike.iloc[i]['strike']:.0f} to {gamma_by_strike.iloc[i + 1]['strike']:.0f}"
-                })
+        # Find gamma flip points (zero gamma level) between adjacent strikes where exposure changes sign
+        strikes = gamma_by_strike['strike'].to_numpy()
+        sign_change = (
+            ((gamma_values[:-1] > 0) & (gamma_values[1:] < 0)) |
+            ((gamma_values[:-1] < 0) & (gamma_values[1:] > 0))
+        )
+        lower_strikes = strikes[:-1][sign_change]
+        upper_strikes = strikes[1:][sign_change]
+        gamma_flip_strikes = (lower_strikes + upper_strikes) / 2
+        
+        gamma_flip_candidates = [
+            {'strike': flip_strike, 'transition': f"{lower:.0f} to {upper:.0f}"}
+            for flip_strike, lower, upper in zip(gamma_flip_strikes, lower_strikes, upper_strikes)
+        ]
         
         return {
             'regime': regime,
@@ -510,7 +606,8 @@ class GammaExposureAnalyzer:
             'total_positive_gamma': total_positive_gamma,
             'total_negative_gamma': total_negative_gamma,
             'near_money_gamma': near_money_gamma,
-            'gamma_flip_points': gamma_flip_candidates
+            'gamma_flip_points': gamma_flip_candidates,
+            'gamma_flip_strikes': np.sort(gamma_flip_strikes)
         }
     
     def generate_trading_signals(self):
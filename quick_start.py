@@ -61,7 +61,7 @@ def quick_start_demo():
         options_data = analyzer.get_options_data()
         
         if options_data:
-            total_options = sum(len(df) for df in options_data.values())
+            total_options = analyzer.total_options()
             print(f"   ✅ Found {len(options_data)} expiration dates")
             print(f"   ✅ Total options contracts: {total_options:,}")
         
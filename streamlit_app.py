@@ -9,16 +9,63 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-import time
 from datetime import datetime as dt, timedelta
+from functools import lru_cache
+import glob
+import json
+import os
+import re
+import threading
 import warnings
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Import our gamma exposure modules
-from gamma_exposure_analyzer import GammaExposureAnalyzer
+from gamma_exposure_analyzer import GammaExposureAnalyzer, PRICE_CACHE_TTL
 from advanced_analysis import AdvancedGammaAnalysis
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
 warnings.filterwarnings('ignore')
 
+# Quick-select symbols shown in the sidebar
+POPULAR_SYMBOLS = ["SPY", "QQQ", "AAPL", "NVDA", "TSLA", "NFLX"]
+
+# Maximum strike rows sent to the browser in the gamma heatmap
+MAX_HEATMAP_ROWS = 200
+
+# Maximum strike bars in the gamma profile chart before LTTB downsampling kicks in
+MAX_PROFILE_POINTS = 2000
+
+# Static layout of the heatmap and profile charts (only title and uirevision vary per symbol)
+HEATMAP_LAYOUT = dict(
+    xaxis_title="Expiration Date",
+    yaxis_title="Strike Price",
+    height=600,
+    xaxis=dict(tickangle=45)
+)
+
+PROFILE_LAYOUT = dict(
+    xaxis_title="Strike Price",
+    yaxis_title="Gamma Exposure ($)",
+    height=500,
+    showlegend=True
+)
+
+# On-disk Parquet snapshots of per-option exposures (survive app restarts, roll over hourly)
+SNAPSHOT_DIR = '.cache'
+
+# Accepted ticker symbols (letters, digits and the . ^ = - used by index/FX/futures symbols);
+# anything else is rejected before it reaches yfinance or a snapshot file name
+TICKER_PATTERN = re.compile(r"[A-Z0-9.^=-]{1,15}")
+
+# Opt-in Polars backend for the data-table strike filtering (set GAMMA_USE_POLARS=1)
+USE_POLARS = POLARS_AVAILABLE and os.environ.get('GAMMA_USE_POLARS', '0') == '1'
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Gamma Exposure Dashboard",
@@ -51,132 +98,386 @@ st.markdown("""
         padding: 5px;
         border-radius: 3px;
     }
+    .gamma-matrix {
+        max-height: 400px;
+        overflow: auto;
+        margin-bottom: 1rem;
+    }
+    .gamma-matrix table {
+        border-collapse: collapse;
+        font-size: 0.85rem;
+        width: 100%;
+    }
+    .gamma-matrix th, .gamma-matrix td {
+        border: 1px solid #e0e0e0;
+        padding: 2px 8px;
+        text-align: right;
+        white-space: nowrap;
+    }
+    .gamma-matrix thead th {
+        position: sticky;
+        top: 0;
+        background-color: #f0f2f6;
+    }
 </style>
 """, unsafe_allow_html=True)
 
+def select_expiration_columns(columns, months_ahead, limit):
+    """Return up to `limit` expiration columns within `months_ahead` months.
+    
+    Columns that don't parse as YYYY-MM-DD dates are always kept.
+    """
+    months_out = pd.Timestamp(dt.now() + timedelta(days=30 * months_ahead))
+    parsed = pd.to_datetime(pd.Index(columns).astype(str), format='%Y-%m-%d', errors='coerce')
+    keep = parsed.isna() | (parsed <= months_out)
+    return list(columns[keep][:limit])
+
 def create_gamma_heatmap(gamma_matrix, current_price, symbol, months_ahead=3):
     """Create an interactive heatmap of gamma exposure"""
     if gamma_matrix is None or gamma_matrix.empty:
         return None
     
-    # Limit to strikes within reasonable range of current price
+    # Limit to strikes within reasonable range of current price (strike index is sorted)
     price_range = current_price * 0.25  # 25% range
-    relevant_strikes = gamma_matrix.index[
-        (gamma_matrix.index >= current_price - price_range) &
-        (gamma_matrix.index <= current_price + price_range)
-    ]
+    strikes = gamma_matrix.index.to_numpy()
+    lo = np.searchsorted(strikes, current_price - price_range, side='left')
+    hi = np.searchsorted(strikes, current_price + price_range, side='right')
     
-    if len(relevant_strikes) == 0:
-        relevant_strikes = gamma_matrix.index
+    if lo == hi:
+        lo, hi = 0, len(strikes)
     
-    # Filter columns to only show expirations within specified months
-    current_date = dt.now()
-    months_out = current_date + timedelta(days=30 * months_ahead)
-    
-    # Filter columns by date (assuming column names are date strings)
-    relevant_columns = []
-    for col in gamma_matrix.columns:
-        try:
-            # Try to parse the column as a date
-            col_date = dt.strptime(str(col), '%Y-%m-%d')
-            if col_date <= months_out:
-                relevant_columns.append(col)
-        except (ValueError, TypeError):
-            # If parsing fails, include the column (might be a different format)
-            relevant_columns.append(col)
-    
-    # Limit to first 12 columns if we still have too many (for heatmap readability)
-    if len(relevant_columns) > 12:
-        relevant_columns = relevant_columns[:12]
+    # Filter columns to expirations within specified months (max 12 for heatmap readability)
+    relevant_columns = select_expiration_columns(gamma_matrix.columns, months_ahead, limit=12)
     
     # Get subset of data
-    plot_matrix = gamma_matrix.loc[relevant_strikes, relevant_columns]
-    
-    # Create heatmap
-    fig = go.Figure(data=go.Heatmap(
-        z=plot_matrix.values,
-        x=plot_matrix.columns,
-        y=plot_matrix.index,
-        colorscale='RdYlBu_r',
-        zmid=0,
-        hovertemplate='Strike: $%{y}<br>Expiration: %{x}<br>Gamma Exposure: $%{z:,.0f}<extra></extra>',
-        colorbar=dict(title="Gamma Exposure ($)")
-    ))
-    
-    # Add current price line
-    fig.add_hline(
-        y=current_price,
-        line_dash="dash",
-        line_color="red",
-        line_width=3,
-        annotation_text=f"Current Price: ${current_price:.2f}",
-        annotation_position="left"
-    )
+    plot_matrix = gamma_matrix.iloc[lo:hi][relevant_columns]
+    
+    # Thin out very long strike ranges; go.Heatmap keeps exact hover values unlike a binary image
+    if len(plot_matrix) > MAX_HEATMAP_ROWS:
+        step = -(-len(plot_matrix) // MAX_HEATMAP_ROWS)
+        plot_matrix = plot_matrix.iloc[::step]
     
-    fig.update_layout(
-        title=f"{symbol} Gamma Exposure Heatmap",
-        xaxis_title="Expiration Date",
-        yaxis_title="Strike Price",
-        height=600,
-        xaxis=dict(tickangle=45)
+    # Whole figure in one constructor call: a single validation pass instead of per-update relayouts
+    # (float32 z halves the payload; strikes stay float64 so hover labels stay exact)
+    return go.Figure({
+        'data': [{
+            'type': 'heatmap',
+            'z': plot_matrix.to_numpy(dtype=np.float32, na_value=np.nan),
+            'x': plot_matrix.columns.astype(str).tolist(),
+            'y': plot_matrix.index.to_numpy(),
+            'colorscale': 'RdYlBu_r',
+            'zmid': 0,
+            'hovertemplate': 'Strike: $%{y}<br>Expiration: %{x}<br>Gamma Exposure: $%{z:,.0f}<extra></extra>',
+            'colorbar': {'title': {'text': "Gamma Exposure ($)"}}
+        }],
+        'layout': {
+            'title': {'text': f"{symbol} Gamma Exposure Heatmap"},
+            'uirevision': symbol,  # keep zoom/pan across reruns for the same symbol
+            # Current price line across the plot, labelled on the left
+            'shapes': [{
+                'type': 'line', 'xref': 'x domain', 'x0': 0, 'x1': 1, 'yref': 'y', 'y0': current_price, 'y1': current_price,
+                'line': {'color': 'red', 'dash': 'dash', 'width': 3}
+            }],
+            'annotations': [{
+                'text': f"Current Price: ${current_price:.2f}", 'showarrow': False,
+                'xref': 'x domain', 'x': 0, 'xanchor': 'right', 'yref': 'y', 'y': current_price, 'yanchor': 'middle'
+            }],
+            **HEATMAP_LAYOUT
+        }
+    })
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def results_csv(_results, ticker, timestamp, key, index=True):
+    """CSV download bytes for one of the analysis DataFrames, built once per analysis run"""
+    return _results[key].to_csv(index=index).encode('utf-8')
+
+def strike_window_polars(matrix, lower, upper, columns):
+    """Rows of a matrix with strikes in [lower, upper], filtered in Polars and returned Arrow-backed"""
+    index_name = matrix.index.name or 'index'
+    window = (
+        pl.from_pandas(matrix.reset_index())
+        .filter(pl.col(index_name).is_between(lower, upper))
+        .select([index_name, *columns])
     )
+    result = window.to_pandas(use_pyarrow_extension_array=True).set_index(index_name)
+    result.index = result.index.astype(matrix.index.dtype)
+    return result.rename_axis(index=matrix.index.name, columns=matrix.columns.name)
+
+def drop_zero_rows_and_columns(matrix):
+    """Remove rows and columns that are all zeros, from a single comparison over the values"""
+    non_zero = matrix.to_numpy(dtype=float, na_value=np.nan) != 0
+    return matrix.iloc[non_zero.any(axis=1), non_zero.any(axis=0)]
+
+@st.cache_data(max_entries=64)
+def filter_exposure_matrices(_results, ticker, timestamp, price_range_pct, months_ahead, show_zeros, highlight_only):
+    """
+    Filter the gamma, vanna and charm matrices for the data tables.
+    
+    `ticker` and `timestamp` identify the analysis run, so the results dict itself
+    is not hashed on every rerun.
+    """
+    gamma_matrix = _results['gamma_matrix']
+    current_price = _results['current_price']
+    
+    # Strike index (sorted ascending) and expiration columns are shared by the gamma, vanna
+    # and charm matrices, so one row window and one set of column positions serve all three
+    price_range = current_price * (price_range_pct / 100)
+    strikes = gamma_matrix.index.to_numpy()
+    lo = np.searchsorted(strikes, current_price - price_range, side='left')
+    hi = np.searchsorted(strikes, current_price + price_range, side='right')
+    
+    # Filter columns to expirations within selected months (max 15 for display purposes)
+    relevant_columns = select_expiration_columns(gamma_matrix.columns, months_ahead, limit=15)
+    col_pos = gamma_matrix.columns.get_indexer(relevant_columns) if relevant_columns else slice(None)
+    
+    filtered = {}
+    for key in ('gamma_matrix', 'vanna_matrix', 'charm_matrix'):
+        matrix = _results[key]
+        if matrix is None or matrix.empty:
+            filtered[key] = None
+            continue
+        
+        if USE_POLARS:
+            matrix = strike_window_polars(matrix, current_price - price_range, current_price + price_range,
+                                          relevant_columns or list(matrix.columns))
+        else:
+            matrix = matrix.iloc[lo:hi, col_pos]
+        if not show_zeros:
+            matrix = drop_zero_rows_and_columns(matrix)
+        filtered[key] = matrix
+    
+    # If "Show Only Key Levels" is selected, filter to show only high/low strikes
+    filtered_matrix = filtered['gamma_matrix']
+    key_strikes = set()
+    if highlight_only:
+        # Strike of the largest positive and most negative value in each expiration
+        positive = filtered_matrix.where(filtered_matrix > 0).dropna(axis=1, how='all')
+        negative = filtered_matrix.where(filtered_matrix < 0).dropna(axis=1, how='all')
+        key_strikes = set(positive.idxmax()).union(negative.idxmin())
+        
+        if key_strikes:
+            filtered_matrix = filtered_matrix.loc[sorted(key_strikes, reverse=True)]
+    else:
+        # Highest to lowest strike; the window is already sorted ascending, so just reverse it
+        filtered_matrix = filtered_matrix.iloc[::-1]
+    filtered['gamma_matrix'] = filtered_matrix
+    
+    # Vanna and charm follow the gamma key strikes
+    for key in ('vanna_matrix', 'charm_matrix'):
+        matrix = filtered[key]
+        if matrix is None:
+            continue
+        
+        if highlight_only:
+            available_strikes = key_strikes.intersection(matrix.index)
+            if available_strikes:
+                matrix = matrix.loc[sorted(available_strikes, reverse=True)]
+        else:
+            # Highest to lowest strike
+            matrix = matrix.iloc[::-1]
+        filtered[key] = matrix
+    
+    return filtered
+
+def lttb_indices(x, y, n_out):
+    """Positions kept by Largest-Triangle-Three-Buckets downsampling of the series (x, y) to n_out points"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the interior is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
     
-    return fig
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Third triangle vertex: average of the next bucket (or the last point)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        areas = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        keep[bucket + 1] = selected
+    
+    return keep
 
-def create_gamma_profile_chart(gamma_by_strike, current_price, symbol):
-    """Create gamma exposure profile bar chart"""
+def create_gamma_profile_chart(gamma_by_strike, current_price, symbol, key_strikes=()):
+    """Create gamma exposure profile bar chart (bars at key_strikes survive downsampling)"""
     if gamma_by_strike is None or gamma_by_strike.empty:
         return None
     
     # Sort by strike
     gamma_by_strike = gamma_by_strike.sort_values('strike')
     
-    # Create color mapping
-    colors = ['green' if x > 0 else 'red' for x in gamma_by_strike['gamma_exposure']]
+    # Wide strike ladders keep the visually significant bars only (king node is plotted separately)
+    king_node = gamma_by_strike[gamma_by_strike['is_king_node']]
+    if len(gamma_by_strike) > MAX_PROFILE_POINTS:
+        strikes = gamma_by_strike['strike'].to_numpy(dtype=float)
+        keep = lttb_indices(strikes, gamma_by_strike['gamma_exposure'].to_numpy(dtype=float),
+                            MAX_PROFILE_POINTS)
+        
+        # LTTB follows the line shape and can skip single bars, so the bars at (or, for flip
+        # midpoints, either side of) each key strike and the king node are always added back
+        key_positions = np.searchsorted(strikes, np.asarray(key_strikes, dtype=float))
+        anchors = np.concatenate([key_positions - 1, key_positions,
+                                  np.flatnonzero(gamma_by_strike['is_king_node'].to_numpy())])
+        keep = np.union1d(keep, anchors.clip(0, len(strikes) - 1))
+        gamma_by_strike = gamma_by_strike.iloc[keep]
     
-    fig = go.Figure()
+    gamma_values = gamma_by_strike['gamma_exposure'].to_numpy()
     
-    # Add gamma exposure bars
-    fig.add_trace(go.Bar(
-        x=gamma_by_strike['strike'],
-        y=gamma_by_strike['gamma_exposure'],
-        marker_color=colors,
-        hovertemplate='Strike: $%{x}<br>Gamma Exposure: $%{y:,.0f}<extra></extra>',
-        name='Gamma Exposure'
-    ))
+    # Gamma exposure bars, colored by sign
+    traces = [{
+        'type': 'bar',
+        'x': gamma_by_strike['strike'].to_numpy(),
+        'y': gamma_values,
+        'marker': {'color': np.where(gamma_values > 0, 'green', 'red'), 'line': {'width': 0}},
+        'hovertemplate': 'Strike: $%{x}<br>Gamma Exposure: $%{y:,.0f}<extra></extra>',
+        'name': 'Gamma Exposure'
+    }]
     
     # Highlight king node
-    king_node = gamma_by_strike[gamma_by_strike['is_king_node']]
     if len(king_node) > 0:
-        fig.add_trace(go.Bar(
-            x=king_node['strike'],
-            y=king_node['gamma_exposure'],
-            marker_color='gold',
-            hovertemplate='King Node<br>Strike: $%{x}<br>Gamma Exposure: $%{y:,.0f}<extra></extra>',
-            name='King Node'
-        ))
-    
-    # Add current price line
-    fig.add_vline(
-        x=current_price,
-        line_dash="dash",
-        line_color="black",
-        line_width=2,
-        annotation_text=f"Current Price: ${current_price:.2f}"
-    )
+        traces.append({
+            'type': 'bar',
+            'x': king_node['strike'].to_numpy(),
+            'y': king_node['gamma_exposure'].to_numpy(),
+            'marker': {'color': 'gold', 'line': {'width': 0}},
+            'hovertemplate': 'King Node<br>Strike: $%{x}<br>Gamma Exposure: $%{y:,.0f}<extra></extra>',
+            'name': 'King Node'
+        })
     
-    fig.update_layout(
-        title=f"{symbol} Gamma Exposure Profile",
-        xaxis_title="Strike Price",
-        yaxis_title="Gamma Exposure ($)",
-        height=500,
-        showlegend=True
-    )
+    # Whole figure in one constructor call: a single validation pass instead of per-update relayouts
+    return go.Figure({
+        'data': traces,
+        'layout': {
+            'title': {'text': f"{symbol} Gamma Exposure Profile"},
+            'uirevision': symbol,  # keep zoom/pan across reruns for the same symbol
+            # Current price line up the plot, labelled at the top
+            'shapes': [{
+                'type': 'line', 'xref': 'x', 'x0': current_price, 'x1': current_price, 'yref': 'y domain', 'y0': 0, 'y1': 1,
+                'line': {'color': 'black', 'dash': 'dash', 'width': 2}
+            }],
+            'annotations': [{
+                'text': f"Current Price: ${current_price:.2f}", 'showarrow': False,
+                'xref': 'x', 'x': current_price, 'xanchor': 'left', 'yref': 'y domain', 'y': 1, 'yanchor': 'top'
+            }],
+            **PROFILE_LAYOUT
+        }
+    })
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def profile_chart_json(_results, ticker, timestamp):
+    """Serialized gamma profile chart for an analysis run, so reruns skip figure construction"""
+    # Support/resistance, king node and flip strikes must stay visible if the profile is downsampled
+    levels = _results['levels'] or {}
+    sentiment = _results['sentiment'] or {}
+    king_node = levels.get('king_node')
+    key_strikes = [
+        *levels.get('support_levels', []),
+        *levels.get('resistance_levels', []),
+        *([] if king_node is None else [king_node['strike']]),
+        *sentiment.get('gamma_flip_strikes', [])
+    ]
     
-    return fig
+    fig = create_gamma_profile_chart(_results['gamma_by_strike'], _results['current_price'], ticker, key_strikes)
+    return fig.to_json() if fig else None
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def heatmap_chart_json(_results, ticker, timestamp, months_ahead):
+    """Serialized gamma heatmap for an analysis run and expiration horizon"""
+    fig = create_gamma_heatmap(_results['gamma_matrix'], _results['current_price'], ticker, months_ahead)
+    return fig.to_json() if fig else None
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_key_levels_display(_results, ticker, timestamp):
+    """Key levels with formatted columns, plus the renamed table shown in the Key Levels tab"""
+    display_levels = _results['key_levels'].copy()
+    display_levels['gamma_exposure_formatted'] = format_currency_array(display_levels['gamma_exposure'])
+    display_levels['distance_pct_formatted'] = np.char.mod('%.1f%%', display_levels['distance_pct'].to_numpy(dtype=float))
+    display_levels['strike_formatted'] = np.char.mod('$%.2f', display_levels['strike'].to_numpy(dtype=float))
+    
+    # Always use 'direction' column as we confirmed it exists
+    display_columns = [
+        'level_type', 'strike_formatted', 'gamma_exposure_formatted', 
+        'distance_pct_formatted', 'direction'
+    ]
+    column_names = {
+        'level_type': 'Level Type',
+        'strike_formatted': 'Strike Price',
+        'gamma_exposure_formatted': 'Gamma Exposure',
+        'distance_pct_formatted': 'Distance from Current',
+        'direction': 'Direction'
+    }
+    
+    return display_levels, display_levels[display_columns].rename(columns=column_names)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_flip_table(_results, ticker, timestamp):
+    """Ten flip points closest to the current price (within 15%), formatted for display"""
+    flip_strikes = _results['sentiment']['gamma_flip_strikes']
+    current_price = _results['current_price']
+    
+    nearby = flip_strikes[np.abs(flip_strikes - current_price) / current_price <= 0.15]  # Within 15%
+    closest = nearby[np.argsort(np.abs(nearby - current_price), kind='stable')[:10]]
+    
+    return pd.DataFrame({
+        'Strike Price': np.char.mod('$%.0f', closest),
+        'Distance': np.char.mod('%+.1f%%', (closest - current_price) / current_price * 100),
+        'Position': np.where(closest > current_price, 'Above', 'Below')
+    })
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_sentiment_summary(_results, ticker, timestamp):
+    """Market sentiment metrics table for the Summary tab"""
+    sentiment = _results['sentiment']
+    return pd.DataFrame({
+        'Metric': [
+            'Market Regime',
+            'Net Gamma Exposure',
+            'Total Positive Gamma',
+            'Total Negative Gamma',
+            'Near Money Gamma'
+        ],
+        'Value': [
+            sentiment['regime'],
+            format_currency(sentiment['net_gamma']),
+            format_currency(sentiment['total_positive_gamma']),
+            format_currency(sentiment['total_negative_gamma']),
+            format_currency(sentiment['near_money_gamma'])
+        ]
+    })
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_positioning_summary(_results, ticker, timestamp):
+    """Dealer positioning metrics table for the Summary tab"""
+    positioning = _results['positioning']
+    return pd.DataFrame({
+        'Metric': [
+            'Call Gamma Exposure',
+            'Put Gamma Exposure',
+            'ATM Call Gamma',
+            'ATM Put Gamma',
+            'Put/Call Gamma Ratio'
+        ],
+        'Value': [
+            format_currency(positioning['call_gamma_exposure']),
+            format_currency(positioning['put_gamma_exposure']),
+            format_currency(positioning['atm_call_gamma']),
+            format_currency(positioning['atm_put_gamma']),
+            f"{positioning['pc_ratio_gamma']:.2f}"
+        ]
+    })
+
+@lru_cache(maxsize=4096)
 def format_currency(value):
-    """Format currency values for display"""
+    """Format currency values for display (memoized; metric values repeat across reruns)"""
     if abs(value) >= 1e9:
         return f"${value/1e9:.2f}B"
     elif abs(value) >= 1e6:
@@ -186,6 +487,108 @@ def format_currency(value):
     else:
         return f"${value:.2f}"
 
+def format_currency_array(values):
+    """Vectorized format_currency for a column of values"""
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    buckets = [magnitude >= 1e9, magnitude >= 1e6, magnitude >= 1e3]
+    
+    scale = np.select(buckets, [1e9, 1e6, 1e3], default=1.0)
+    suffix = np.select(buckets, ['B', 'M', 'K'], default='')
+    return np.char.add(np.char.mod('$%.2f', values / scale), suffix)
+
+def format_gamma_matrix(matrix):
+    """Format gamma values as strings: 'k' for thousands, regular numbers for < 1000"""
+    values = np.nan_to_num(matrix.to_numpy(dtype=float, na_value=np.nan))
+    
+    # Each cell is formatted by exactly one branch, so no strings are built and then discarded
+    thousands = np.abs(values) >= 1000
+    units = ~thousands & (values != 0)
+    
+    formatted = np.full(values.shape, '0', dtype=object)
+    if thousands.any():
+        # Values within 0.05k of a whole thousand print without the trailing '.0'
+        k = values[thousands] / 1000
+        whole = np.abs(k - np.round(k)) < 0.05
+        k_formatted = np.empty(k.shape, dtype=object)
+        if whole.any():
+            k_formatted[whole] = np.char.mod('%.0fk', k[whole])
+        if not whole.all():
+            k_formatted[~whole] = np.char.mod('%.1fk', k[~whole])
+        formatted[thousands] = k_formatted
+    if units.any():
+        formatted[units] = np.char.mod('%d', np.round(values[units]))
+    
+    return pd.DataFrame(formatted, index=matrix.index, columns=matrix.columns)
+
+# Cell styles for matrix highlighting
+POSITIVE_HIGH_STYLE = 'background-color: #90EE90; font-weight: bold; color: #006400;'
+NEGATIVE_LOW_STYLE = 'background-color: #FFB6C1; font-weight: bold; color: #8B0000;'
+KING_NODE_STYLE = 'background-color: #FFD700; font-weight: bold; color: #B8860B; border: 2px solid #DAA520;'
+
+def highlight_high_low(values, king_pos=None):
+    """
+    Highlight highest and lowest values in each expiration column, plus king node row in yellow
+    """
+    styles = np.full(values.shape, '', dtype=object)
+    
+    # Only consider non-zero values for highlighting
+    non_zero = (values != 0) & ~np.isnan(values)
+    col_max = np.where(non_zero, values, -np.inf).max(axis=0, initial=-np.inf)
+    col_min = np.where(non_zero, values, np.inf).min(axis=0, initial=np.inf)
+    
+    # Maximum values (positive gamma - green) and minimum values (negative gamma - red)
+    styles[non_zero & (values == col_max) & (col_max > 0)] = POSITIVE_HIGH_STYLE
+    styles[non_zero & (values == col_min) & (col_min < 0)] = NEGATIVE_LOW_STYLE
+    
+    # King node strike in yellow overrides high/low highlighting (only in columns with data)
+    if king_pos is not None:
+        styles[king_pos, non_zero.any(axis=0)] = KING_NODE_STYLE
+    
+    return styles
+
+def matrix_cell_styles(matrix, king_node_strike):
+    """CSS string for every cell of a strike x expiration matrix"""
+    # All columns share the strike index, so find the king node row once per matrix
+    king_pos = None
+    if king_node_strike is not None and king_node_strike in matrix.index:
+        king_pos = matrix.index.get_loc(king_node_strike)
+    
+    return highlight_high_low(matrix.to_numpy(dtype=float, na_value=np.nan), king_pos)
+
+def style_matrix(matrix, king_node_strike):
+    """Styler with values in k notation, highlighted from the underlying numerical data"""
+    styles = matrix_cell_styles(matrix, king_node_strike)
+    return format_gamma_matrix(matrix).style.apply(lambda _: styles, axis=None)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_matrix_html(_matrix, view_key, king_node_strike):
+    """
+    Pre-render a highlighted matrix as a scrollable HTML table (bypasses Styler).
+    
+    `view_key` identifies the analysis run, display options and matrix, so the
+    matrix itself is not hashed on every rerun.
+    """
+    matrix = _matrix
+    styles = matrix_cell_styles(matrix, king_node_strike).astype(str)
+    values = format_gamma_matrix(matrix).to_numpy().astype(str)
+    
+    cells = np.char.add(np.char.add('<td style="', styles), '">')
+    cells = np.char.add(np.char.add(cells, values), '</td>')
+    
+    header = ''.join(f'<th>{col}</th>' for col in matrix.columns)
+    rows = ''.join(
+        f'<tr><th>{strike}</th>{"".join(row_cells)}</tr>'
+        for strike, row_cells in zip(matrix.index.astype(str), cells)
+    )
+    
+    return (
+        '<div class="gamma-matrix">'
+        f'<table><thead><tr><th>{matrix.index.name or ""}</th>{header}</tr></thead>'
+        f'<tbody>{rows}</tbody></table>'
+        '</div>'
+    )
+
 def format_gamma_regime(regime):
     """Format gamma regime with appropriate emoji and color"""
     if "Positive" in regime:
@@ -195,6 +598,127 @@ def format_gamma_regime(regime):
     else:
         return "⚪ " + regime, ""
 
+def to_arrow_matrix(matrix):
+    """Store a strike x expiration matrix with Arrow-backed columns for cheaper Streamlit serialization"""
+    if matrix is None:
+        return None
+    return matrix.astype('float64[pyarrow]')
+
+def snapshot_path(ticker):
+    """Parquet snapshot path for a ticker in the current hour"""
+    if not TICKER_PATTERN.fullmatch(ticker):
+        raise ValueError(f"Invalid ticker symbol: {ticker}")
+    return os.path.join(SNAPSHOT_DIR, f"{ticker}_{dt.now():%Y%m%d_%H}.parquet")
+
+def load_snapshot(analyzer, path):
+    """Restore spot price and per-option exposures from a snapshot, returns the fetch time or None
+    
+    Snapshots older than PRICE_CACHE_TTL are ignored. Only current_price and gamma_exposure_data
+    are restored; options_data is cleared because the raw option chains are not part of the snapshot.
+    """
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        # Check the age from the footer metadata before reading the table itself
+        metadata = pq.read_schema(path).metadata
+        fetched_at = dt.fromisoformat(metadata[b'fetched_at'].decode())
+        if (dt.now() - fetched_at).total_seconds() > PRICE_CACHE_TTL:
+            return None
+        
+        current_price = float(metadata[b'current_price'])
+        table = pq.read_table(path)
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowException):
+        return None
+    
+    analyzer.current_price = current_price
+    analyzer.options_data = {}
+    analyzer.gamma_exposure_data = table.to_pandas()
+    return fetched_at
+
+def save_snapshot(analyzer, path, fetched_at):
+    """Write per-option exposures to Parquet, with the spot price and fetch time in the schema metadata
+    
+    Older snapshots of the same ticker are removed so the cache directory doesn't grow every hour.
+    """
+    table = pa.Table.from_pandas(analyzer.gamma_exposure_data, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'current_price'] = str(analyzer.current_price).encode()
+    metadata[b'fetched_at'] = fetched_at.isoformat().encode()
+    
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        pq.write_table(table.replace_schema_metadata(metadata), path)
+        
+        ticker = os.path.basename(path).rsplit('_', 2)[0]
+        for old_path in glob.glob(os.path.join(SNAPSHOT_DIR, f"{glob.escape(ticker)}_[0-9]*_[0-9][0-9].parquet")):
+            if old_path != path:
+                os.remove(old_path)
+    except OSError:
+        # Snapshots are only an optimization; a read-only disk shouldn't break the analysis
+        pass
+
+@st.cache_resource(max_entries=32)
+def get_analyzer(ticker):
+    """Shared analyzer per ticker, reusing its yfinance session and cached spot price"""
+    return GammaExposureAnalyzer(ticker)
+
+@st.cache_resource(max_entries=32)
+def get_analyzer_lock(ticker):
+    """Lock guarding the shared analyzer of a ticker against concurrent sessions"""
+    return threading.Lock()
+
+@st.cache_data(ttl=300, show_spinner="📊 Fetching options data and calculating gamma exposure...")
+def run_gamma_analysis(ticker):
+    """Run the full analysis pipeline for a ticker (cached for 5 minutes across sessions)"""
+    if not TICKER_PATTERN.fullmatch(ticker):
+        raise ValueError(f"Invalid ticker symbol: {ticker}")
+    
+    analyzer = get_analyzer(ticker)
+    
+    # The analyzer is shared across sessions, so hold its lock while mutating and reading it
+    with get_analyzer_lock(ticker):
+        # Reuse this hour's snapshot if one exists, skipping the option chain downloads
+        path = snapshot_path(ticker)
+        fetched_at = load_snapshot(analyzer, path)
+        if fetched_at is None:
+            if analyzer.get_current_price() is None:
+                raise ValueError(f"Could not fetch current price for {ticker}")
+            
+            options_data = analyzer.get_options_data()
+            if not options_data:
+                raise ValueError(f"No options data available for {ticker}")
+            
+            gamma_data = analyzer.calculate_gamma_exposure()
+            if gamma_data is None:
+                raise ValueError(f"Could not calculate gamma exposure for {ticker}")
+            
+            fetched_at = dt.now()
+            save_snapshot(analyzer, path, fetched_at)
+        
+        current_price = analyzer.current_price
+        
+        # Advanced analysis
+        advanced = AdvancedGammaAnalysis(analyzer)
+        
+        # Gamma, vanna and charm matrices from one fused pivot
+        matrices = analyzer.aggregate_exposures_by_expiration() or {}
+        
+        return {
+            'ticker': ticker,
+            'current_price': current_price,
+            'gamma_matrix': to_arrow_matrix(matrices.get('gamma_exposure')),
+            'vanna_matrix': to_arrow_matrix(matrices.get('vanna_exposure')),
+            'charm_matrix': to_arrow_matrix(matrices.get('charm_exposure')),
+            'gamma_by_strike': analyzer.aggregate_gamma_by_strike(),
+            'sentiment': analyzer.analyze_market_sentiment(),
+            'levels': analyzer.identify_gamma_levels(),
+            'key_levels': advanced.calculate_gex_profile_levels(10),
+            'positioning': advanced.calculate_dealer_positioning(),
+            # Time the data was fetched, which is earlier than now when restored from a snapshot
+            'timestamp': fetched_at
+        }
+
 def main():
     """Main Streamlit application"""
     
@@ -205,789 +729,471 @@ def main():
     # Sidebar for inputs
     st.sidebar.header("📊 Analysis Parameters")
     
-    # Ticker input
+    # Ticker input (popular symbol selection writes into the same session-state key)
+    if 'ticker' not in st.session_state:
+        st.session_state.ticker = "SPY"
+    
     ticker = st.sidebar.text_input(
         "Enter Ticker Symbol",
-        value="SPY",
+        key="ticker",
         help="Enter a stock symbol (e.g., SPY, AAPL, TSLA)"
     ).upper().strip()
     
-    # Analysis button
-    analyze_button = st.sidebar.button("🚀 Analyze Gamma Exposure", type="primary")
+    # Refresh drops the cached results and this hour's snapshot, forcing fresh chain data
+    def refresh_analysis():
+        symbol = st.session_state.ticker.upper().strip()
+        if not TICKER_PATTERN.fullmatch(symbol):
+            return
+        run_gamma_analysis.clear(symbol)
+        results_csv.clear()
+        try:
+            os.remove(snapshot_path(symbol))
+        except OSError:
+            pass
     
-    # Popular symbols quick select
-    st.sidebar.markdown("### 📈 Popular Symbols")
-    col1, col2 = st.sidebar.columns(2)
+    st.sidebar.button(
+        "🔄 Refresh Analysis",
+        type="primary",
+        on_click=refresh_analysis,
+        help="Fetch fresh options data instead of the cached results"
+    )
     
-    with col1:
-        if st.button("SPY", key="spy"):
-            ticker = "SPY"
-            analyze_button = True
-        if st.button("AAPL", key="aapl"):
-            ticker = "AAPL"
-            analyze_button = True
-        if st.button("TSLA", key="tsla"):
-            ticker = "TSLA"
-            analyze_button = True
+    # Popular symbols quick select (cleared after use so the same symbol can be picked again)
+    def select_popular_symbol():
+        if st.session_state.popular_symbol:
+            st.session_state.ticker = st.session_state.popular_symbol
+            st.session_state.popular_symbol = ""
     
-    with col2:
-        if st.button("QQQ", key="qqq"):
-            ticker = "QQQ"
-            analyze_button = True
-        if st.button("NVDA", key="nvda"):
-            ticker = "NVDA"
-            analyze_button = True
-        if st.button("NFLX", key="nflx"):
-            ticker = "NFLX"
-            analyze_button = True
+    st.sidebar.selectbox(
+        "📈 Popular Symbols",
+        [""] + POPULAR_SYMBOLS,
+        key="popular_symbol",
+        on_change=select_popular_symbol,
+        help="Pick a commonly analyzed symbol"
+    )
     
     # Main content area
     if not ticker:
         st.info("👆 Enter a ticker symbol in the sidebar to begin analysis")
         return
     
-    if analyze_button or 'last_ticker' not in st.session_state or st.session_state.last_ticker != ticker:
-        
-        # Store current ticker
-        st.session_state.last_ticker = ticker
-        
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    try:
+        results = run_gamma_analysis(ticker)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+    except Exception as e:
+        st.error(f"❌ Analysis failed: {str(e)}")
+        return
+    
+    # Download filenames are stamped with the analysis time, so they match the data they contain
+    run_ts_str = results['timestamp'].strftime('%Y%m%d_%H%M%S')
+    
+    # Header with basic info
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="Symbol",
+            value=results['ticker'],
+            help="Stock symbol being analyzed"
+        )
+    
+    with col2:
+        st.metric(
+            label="Current Price",
+            value=f"${results['current_price']:.2f}",
+            help="Current stock price"
+        )
+    
+    with col3:
+        if results['sentiment']:
+            net_gamma = results['sentiment']['net_gamma']
+            st.metric(
+                label="Net Gamma Exposure",
+                value=format_currency(net_gamma),
+                delta=f"{'Positive' if net_gamma > 0 else 'Negative'} Regime",
+                help="Total net gamma exposure across all options"
+            )
+    
+    with col4:
+        if results['levels'] and results['levels']['king_node'] is not None:
+            king_strike = results['levels']['king_node']['strike']
+            st.metric(
+                label="King Node",
+                value=f"${king_strike:.0f}",
+                delta=f"{abs(king_strike - results['current_price'])/results['current_price']*100:.1f}% away",
+                help="Largest absolute gamma exposure level"
+            )
+    
+    # Market regime
+    if results['sentiment']:
+        regime_text, regime_class = format_gamma_regime(results['sentiment']['regime'])
+        st.markdown(f"### Market Regime: <span class='{regime_class}'>{regime_text}</span>", unsafe_allow_html=True)
+    
+    # Tabs for different views
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Gamma Matrix", "🎯 Key Levels", "📈 Gamma Profile", "📋 Analysis Summary"])
+    
+    with tab1:
+        st.subheader("🔥 Gamma Exposure Matrix")
+        st.markdown("*Strikes (rows) vs Expirations (columns) - Values in USD*")
+        st.info("📅 **Note**: Use the 'Months Ahead' slider to customize the expiration time horizon for optimal readability")
         
-        try:
-            # Step 1: Initialize analyzer
-            status_text.text("🔄 Initializing analyzer...")
-            progress_bar.progress(10)
+        if results['gamma_matrix'] is not None and not results['gamma_matrix'].empty:
+            # Filter options (moved before heatmap so months_ahead is available)
+            st.markdown("#### ⚙️ Display Options")
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                price_range_pct = st.slider(
+                    "Price Range (%)",
+                    min_value=5,
+                    max_value=50,
+                    value=25,
+                    help="Show strikes within this percentage of current price"
+                )
             
-            analyzer = GammaExposureAnalyzer(ticker)
+            with col2:
+                show_zeros = st.checkbox(
+                    "Show Zero Values",
+                    value=False,
+                    help="Include rows/columns with zero gamma exposure"
+                )
             
-            # Step 2: Get current price
-            status_text.text("💰 Getting current price...")
-            progress_bar.progress(20)
+            with col3:
+                highlight_only = st.checkbox(
+                    "Show Only Key Levels",
+                    value=False,
+                    help="Display only strikes with highest/lowest gamma for each expiration"
+                )
             
-            current_price = analyzer.get_current_price()
-            if current_price is None:
-                st.error(f"❌ Could not fetch current price for {ticker}")
-                return
+            with col4:
+                months_ahead = st.slider(
+                    "Months Ahead",
+                    min_value=1,
+                    max_value=12,
+                    value=3,
+                    help="Number of months of expirations to display"
+                )
             
-            # Step 3: Fetch options data
-            status_text.text("📊 Fetching options data...")
-            progress_bar.progress(40)
+            with col5:
+                interactive_tables = st.checkbox(
+                    "Interactive Tables",
+                    value=False,
+                    help="Use sortable tables instead of pre-rendered ones (slower for large matrices)"
+                )
             
-            options_data = analyzer.get_options_data()
-            if not options_data:
-                st.error(f"❌ No options data available for {ticker}")
-                return
+            # Heatmap of the same matrix (figure spec built once per analysis run and horizon)
+            st.markdown("#### 🗺️ Gamma Exposure Heatmap")
+            heatmap_json = heatmap_chart_json(results, results['ticker'], results['timestamp'], months_ahead)
+            if heatmap_json:
+                st.plotly_chart(json.loads(heatmap_json), width='stretch')
             
-            # Step 4: Calculate gamma exposure
-            status_text.text("🧮 Calculating gamma exposure...")
-            progress_bar.progress(70)
+            # Display data table with filtering
+            st.markdown("#### 📋 Gamma Matrix Data Table")
             
-            gamma_data = analyzer.calculate_gamma_exposure()
-            if gamma_data is None:
-                st.error(f"❌ Could not calculate gamma exposure for {ticker}")
-                return
-            
-            # Step 5: Generate analysis
-            status_text.text("📈 Generating analysis...")
-            progress_bar.progress(90)
-            
-            # Get all analysis components
-            gamma_matrix = analyzer.aggregate_gamma_by_expiration()
-            gamma_by_strike = analyzer.aggregate_gamma_by_strike()
-            vanna_matrix = analyzer.aggregate_vanna_by_expiration()
-            charm_matrix = analyzer.aggregate_charm_by_expiration()
-            sentiment = analyzer.analyze_market_sentiment()
-            levels = analyzer.identify_gamma_levels()
-            
-            # Advanced analysis
-            advanced = AdvancedGammaAnalysis(analyzer)
-            key_levels = advanced.calculate_gex_profile_levels(10)
-            positioning = advanced.calculate_dealer_positioning()
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Analysis complete!")
-            time.sleep(1)
-            
-            # Clear progress indicators
-            progress_bar.empty()
-            status_text.empty()
-            
-            # Store results in session state
-            st.session_state.analysis_results = {
-                'ticker': ticker,
-                'current_price': current_price,
-                'gamma_matrix': gamma_matrix,
-                'vanna_matrix': vanna_matrix,
-                'charm_matrix': charm_matrix,
-                'gamma_by_strike': gamma_by_strike,
-                'sentiment': sentiment,
-                'levels': levels,
-                'key_levels': key_levels,
-                'positioning': positioning,
-                'analyzer': analyzer,
-                'timestamp': dt.now()
-            }
-            
-        except Exception as e:
-            st.error(f"❌ Analysis failed: {str(e)}")
-            return
-    
-    # Display results if available
-    if 'analysis_results' in st.session_state:
-        results = st.session_state.analysis_results
-        
-        # Header with basic info
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                label="Symbol",
-                value=results['ticker'],
-                help="Stock symbol being analyzed"
-            )
-        
-        with col2:
-            st.metric(
-                label="Current Price",
-                value=f"${results['current_price']:.2f}",
-                help="Current stock price"
+            # Filter matrices for display, memoized per analysis run + display options
+            # (the same key also caches the rendered HTML tables below)
+            view_key = (
+                results['ticker'], results['timestamp'],
+                price_range_pct, months_ahead, show_zeros, highlight_only
             )
-        
-        with col3:
-            if results['sentiment']:
-                net_gamma = results['sentiment']['net_gamma']
-                st.metric(
-                    label="Net Gamma Exposure",
-                    value=format_currency(net_gamma),
-                    delta=f"{'Positive' if net_gamma > 0 else 'Negative'} Regime",
-                    help="Total net gamma exposure across all options"
-                )
-        
-        with col4:
+            filtered = filter_exposure_matrices(results, *view_key)
+            filtered_matrix = filtered['gamma_matrix']
+            
+            # Get king node strike price if available (highlighted in every expiration column)
+            king_node_strike = None
             if results['levels'] and results['levels']['king_node'] is not None:
-                king_strike = results['levels']['king_node']['strike']
-                st.metric(
-                    label="King Node",
-                    value=f"${king_strike:.0f}",
-                    delta=f"{abs(king_strike - results['current_price'])/results['current_price']*100:.1f}% away",
-                    help="Largest absolute gamma exposure level"
-                )
-        
-        # Market regime
-        if results['sentiment']:
-            regime_text, regime_class = format_gamma_regime(results['sentiment']['regime'])
-            st.markdown(f"### Market Regime: <span class='{regime_class}'>{regime_text}</span>", unsafe_allow_html=True)
-        
-        # Tabs for different views
-        tab1, tab2, tab3, tab4 = st.tabs(["📊 Gamma Matrix", "🎯 Key Levels", "📈 Gamma Profile", "📋 Analysis Summary"])
-        
-        with tab1:
-            st.subheader("🔥 Gamma Exposure Matrix")
-            st.markdown("*Strikes (rows) vs Expirations (columns) - Values in USD*")
-            st.info("📅 **Note**: Use the 'Months Ahead' slider to customize the expiration time horizon for optimal readability")
-            
-            if results['gamma_matrix'] is not None and not results['gamma_matrix'].empty:
-                # Filter options (moved before heatmap so months_ahead is available)
-                st.markdown("#### ⚙️ Display Options")
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    price_range_pct = st.slider(
-                        "Price Range (%)",
-                        min_value=5,
-                        max_value=50,
-                        value=25,
-                        help="Show strikes within this percentage of current price"
-                    )
-                
-                with col2:
-                    show_zeros = st.checkbox(
-                        "Show Zero Values",
-                        value=False,
-                        help="Include rows/columns with zero gamma exposure"
-                    )
-                
-                with col3:
-                    highlight_only = st.checkbox(
-                        "Show Only Key Levels",
-                        value=False,
-                        help="Display only strikes with highest/lowest gamma for each expiration"
-                    )
-                
-                with col4:
-                    months_ahead = st.slider(
-                        "Months Ahead",
-                        min_value=1,
-                        max_value=12,
-                        value=3,
-                        help="Number of months of expirations to display"
-                    )
-                
-                # Display data table with filtering
-                st.markdown("#### 📋 Gamma Matrix Data Table")
-                
-                # Filter matrix for display
-                price_range = results['current_price'] * (price_range_pct / 100)
-                filtered_matrix = results['gamma_matrix'].loc[
-                    (results['gamma_matrix'].index >= results['current_price'] - price_range) &
-                    (results['gamma_matrix'].index <= results['current_price'] + price_range)
-                ]
-                
-                # Filter columns to only show expirations within selected months
-                current_date = dt.now()
-                months_out = current_date + timedelta(days=30 * months_ahead)
-                
-                relevant_columns = []
-                for col in filtered_matrix.columns:
-                    try:
-                        col_date = dt.strptime(str(col), '%Y-%m-%d')
-                        if col_date <= months_out:
-                            relevant_columns.append(col)
-                    except (ValueError, TypeError):
-                        relevant_columns.append(col)
-                
-                # Limit to first 15 columns if we still have too many (for display purposes)
-                if len(relevant_columns) > 15:
-                    relevant_columns = relevant_columns[:15]
-                
-                # Apply column filtering
-                if relevant_columns:
-                    filtered_matrix = filtered_matrix[relevant_columns]
-                
-                if not show_zeros:
-                    # Remove rows and columns that are all zeros
-                    filtered_matrix = filtered_matrix.loc[~(filtered_matrix == 0).all(axis=1)]
-                    filtered_matrix = filtered_matrix.loc[:, ~(filtered_matrix == 0).all(axis=0)]
-                
-                # If "Show Only Key Levels" is selected, filter to show only high/low strikes
-                if highlight_only:
-                    key_strikes = set()
-                    for col in filtered_matrix.columns:
-                        col_data = filtered_matrix[col]
-                        non_zero_data = col_data[col_data != 0]
-                        
-                        if len(non_zero_data) > 0:
-                            max_val = non_zero_data.max()
-                            min_val = non_zero_data.min()
-                            
-                            # Add strikes with max/min values
-                            if max_val > 0:
-                                max_strikes = col_data[col_data == max_val].index
-                                key_strikes.update(max_strikes)
-                            
-                            if min_val < 0:
-                                min_strikes = col_data[col_data == min_val].index
-                                key_strikes.update(min_strikes)
-                    
-                    if key_strikes:
-                        filtered_matrix = filtered_matrix.loc[list(key_strikes)]
-                        filtered_matrix = filtered_matrix.sort_index(ascending=False)
+                king_node_strike = results['levels']['king_node']['strike']
+            
+            def show_matrix(matrix, matrix_key):
+                """Render a filtered matrix as a cached HTML table, or a sortable dataframe if requested"""
+                if interactive_tables:
+                    st.dataframe(style_matrix(matrix, king_node_strike), width='stretch', height=400)
                 else:
-                    # Sort all data from highest to lowest strike
-                    filtered_matrix = filtered_matrix.sort_index(ascending=False)
-                
-                # Format for display with k notation for values >= 1000
-                def format_gamma_values(value):
-                    """Format gamma values: use 'k' for thousands, regular numbers for < 1000"""
-                    if pd.isna(value) or value == 0:
-                        return "0"
-                    
-                    abs_value = abs(value)
-                    if abs_value >= 1000:
-                        # Format as k (thousands)
-                        formatted = f"{value/1000:.1f}k"
-                        # Remove unnecessary .0
-                        if formatted.endswith('.0k'):
-                            formatted = formatted[:-3] + 'k'
-                        return formatted
-                    else:
-                        # Format as regular integer
-                        return str(int(round(value)))
+                    html = render_matrix_html(matrix, view_key + (matrix_key,), king_node_strike)
+                    st.markdown(html, unsafe_allow_html=True)
+            
+            # Add legend for highlighting
+            st.markdown("""
+            **📊 Color Legend:**
+            - � **Yellow**: King Node (highest absolute gamma exposure strike price)
+            - �🟢 **Green**: Highest positive gamma exposure for each expiration
+            - 🔴 **Red**: Highest negative gamma exposure for each expiration
+            - ⚪ **White**: Other gamma exposure values
+            """)
+            
+            show_matrix(filtered_matrix, 'gamma_matrix')
+            
+            # Download button
+            csv = results_csv(results, results['ticker'], results['timestamp'], 'gamma_matrix')
+            st.download_button(
+                label="📥 Download Full Matrix CSV",
+                data=csv,
+                file_name=f"{results['ticker']}_gamma_matrix_{run_ts_str}.csv",
+                mime="text/csv"
+            )
+            
+            # Add some spacing between matrices
+            st.markdown("---")
+            
+            # Vanna Matrix Data Table
+            st.markdown("#### 📊 Vanna Matrix Data Table")
+            st.markdown("*Vanna exposure by strikes (rows) vs expirations (columns) - Values in USD*")
+            
+            if results['vanna_matrix'] is not None and not results['vanna_matrix'].empty:
+                filtered_vanna_matrix = filtered['vanna_matrix']
                 
-                # Create highlighting function for high/low values and king nodes (works on numerical data)
-                def highlight_high_low(df):
-                    """
-                    Highlight highest and lowest values in each column, plus king nodes in yellow
-                    """
-                    # Create empty styling dataframe
-                    styles = pd.DataFrame('', index=df.index, columns=df.columns)
-                    
-                    # Get king node strike price if available
-                    king_node_strike = None
-                    if results['levels'] and results['levels']['king_node'] is not None:
-                        king_node_strike = results['levels']['king_node']['strike']
-                    
-                    # For each column (expiration), find high/low values
-                    for col in df.columns:
-                        col_data = df[col]
-                        # Only consider non-zero values for highlighting
-                        non_zero_data = col_data[col_data != 0]
-                        
-                        if len(non_zero_data) > 0:
-                            max_val = non_zero_data.max()
-                            min_val = non_zero_data.min()
-                            
-                            # First, highlight king node strike in yellow (highest priority)
-                            if king_node_strike is not None and king_node_strike in df.index:
-                                king_mask = df.index == king_node_strike
-                                styles.loc[king_mask, col] = 'background-color: #FFD700; font-weight: bold; color: #B8860B; border: 2px solid #DAA520;'
-                            
-                            # Then highlight maximum values (positive gamma - green background)
-                            # Only apply if not already highlighted as king node
-                            if max_val > 0:
-                                max_mask = (col_data == max_val) & (col_data != 0)
-                                if king_node_strike is not None:
-                                    max_mask = max_mask & (df.index != king_node_strike)
-                                styles.loc[max_mask, col] = 'background-color: #90EE90; font-weight: bold; color: #006400;'
-                            
-                            # Highlight minimum values (negative gamma - red background)
-                            # Only apply if not already highlighted as king node  
-                            if min_val < 0:
-                                min_mask = (col_data == min_val) & (col_data != 0)
-                                if king_node_strike is not None:
-                                    min_mask = min_mask & (df.index != king_node_strike)
-                                styles.loc[min_mask, col] = 'background-color: #FFB6C1; font-weight: bold; color: #8B0000;'
+                if not filtered_vanna_matrix.empty:
+                    # Apply same styling as gamma matrix
+                    show_matrix(filtered_vanna_matrix, 'vanna_matrix')
                     
-                    return styles
-                
-                # Apply highlighting to numerical data first
-                styled_matrix = filtered_matrix.style.apply(highlight_high_low, axis=None)
-                
-                # Then apply the k-notation formatting to the styled dataframe
-                def format_gamma_values(value):
-                    """Format gamma values: use 'k' for thousands, regular numbers for < 1000"""
-                    if pd.isna(value) or value == 0:
-                        return "0"
+                    # Download button for vanna matrix
+                    vanna_csv = results_csv(results, results['ticker'], results['timestamp'], 'vanna_matrix')
+                    st.download_button(
+                        label="📥 Download Vanna Matrix CSV",
+                        data=vanna_csv,
+                        file_name=f"{results['ticker']}_vanna_matrix_{run_ts_str}.csv",
+                        mime="text/csv"
+                    )
+                else:
+                    st.info("No vanna exposure data to display with current filters. Try adjusting the price range or enabling 'Show Zero Values'.")
                     
-                    abs_value = abs(value)
-                    if abs_value >= 1000:
-                        # Format as k (thousands)
-                        formatted = f"{value/1000:.1f}k"
-                        # Remove unnecessary .0
-                        if formatted.endswith('.0k'):
-                            formatted = formatted[:-3] + 'k'
-                        return formatted
-                    else:
-                        # Format as regular integer
-                        return str(int(round(value)))
-                
-                # Apply number formatting after styling
-                styled_matrix = styled_matrix.format(format_gamma_values)
-                
-                # Add legend for highlighting
-                st.markdown("""
-                **📊 Color Legend:**
-                - � **Yellow**: King Node (highest absolute gamma exposure strike price)
-                - �🟢 **Green**: Highest positive gamma exposure for each expiration
-                - 🔴 **Red**: Highest negative gamma exposure for each expiration
-                - ⚪ **White**: Other gamma exposure values
-                """)
-                
-                st.dataframe(
-                    styled_matrix,
-                    width='stretch',
-                    height=400
-                )
-                
-                # Download button
-                csv = results['gamma_matrix'].to_csv()
-                st.download_button(
-                    label="📥 Download Full Matrix CSV",
-                    data=csv,
-                    file_name=f"{results['ticker']}_gamma_matrix_{dt.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                
-                # Add some spacing between matrices
-                st.markdown("---")
-                
-                # Vanna Matrix Data Table
-                st.markdown("#### 📊 Vanna Matrix Data Table")
-                st.markdown("*Vanna exposure by strikes (rows) vs expirations (columns) - Values in USD*")
+            else:
+                st.warning("No vanna matrix data available")
+            
+            # Add some spacing
+            st.markdown("---")
+            
+            # Charm Matrix Data Table
+            st.markdown("#### ⏰ Charm Matrix Data Table")
+            st.markdown("*Charm exposure by strikes (rows) vs expirations (columns) - Values in USD*")
+            
+            if results['charm_matrix'] is not None and not results['charm_matrix'].empty:
+                filtered_charm_matrix = filtered['charm_matrix']
                 
-                if results['vanna_matrix'] is not None and not results['vanna_matrix'].empty:
-                    # Apply same filtering logic as gamma matrix
-                    filtered_vanna_matrix = results['vanna_matrix'].loc[
-                        (results['vanna_matrix'].index >= results['current_price'] - price_range) &
-                        (results['vanna_matrix'].index <= results['current_price'] + price_range)
-                    ]
-                    
-                    # Apply column filtering (same relevant_columns as gamma matrix)
-                    if relevant_columns:
-                        # Make sure columns exist in vanna matrix
-                        available_vanna_columns = [col for col in relevant_columns if col in filtered_vanna_matrix.columns]
-                        if available_vanna_columns:
-                            filtered_vanna_matrix = filtered_vanna_matrix[available_vanna_columns]
+                if not filtered_charm_matrix.empty:
+                    # Apply same styling as gamma matrix
+                    show_matrix(filtered_charm_matrix, 'charm_matrix')
                     
-                    if not show_zeros:
-                        # Remove rows and columns that are all zeros
-                        filtered_vanna_matrix = filtered_vanna_matrix.loc[~(filtered_vanna_matrix == 0).all(axis=1)]
-                        filtered_vanna_matrix = filtered_vanna_matrix.loc[:, ~(filtered_vanna_matrix == 0).all(axis=0)]
-                    
-                    # If "Show Only Key Levels" is selected, apply same filtering as gamma
-                    if highlight_only:
-                        if key_strikes:  # Use same key_strikes from gamma matrix
-                            available_strikes = [s for s in key_strikes if s in filtered_vanna_matrix.index]
-                            if available_strikes:
-                                filtered_vanna_matrix = filtered_vanna_matrix.loc[available_strikes]
-                                filtered_vanna_matrix = filtered_vanna_matrix.sort_index(ascending=False)
-                    else:
-                        # Sort all data from highest to lowest strike
-                        filtered_vanna_matrix = filtered_vanna_matrix.sort_index(ascending=False)
-                    
-                    if not filtered_vanna_matrix.empty:
-                        # Apply same styling as gamma matrix
-                        styled_vanna_matrix = filtered_vanna_matrix.style.apply(highlight_high_low, axis=None)
-                        styled_vanna_matrix = styled_vanna_matrix.format(format_gamma_values)
-                        
-                        st.dataframe(
-                            styled_vanna_matrix,
-                            width='stretch',
-                            height=400
-                        )
-                        
-                        # Download button for vanna matrix
-                        vanna_csv = results['vanna_matrix'].to_csv()
-                        st.download_button(
-                            label="📥 Download Vanna Matrix CSV",
-                            data=vanna_csv,
-                            file_name=f"{results['ticker']}_vanna_matrix_{dt.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv"
-                        )
-                    else:
-                        st.info("No vanna exposure data to display with current filters. Try adjusting the price range or enabling 'Show Zero Values'.")
-                        
+                    # Download button for charm matrix
+                    charm_csv = results_csv(results, results['ticker'], results['timestamp'], 'charm_matrix')
+                    st.download_button(
+                        label="📥 Download Charm Matrix CSV",
+                        data=charm_csv,
+                        file_name=f"{results['ticker']}_charm_matrix_{run_ts_str}.csv",
+                        mime="text/csv"
+                    )
                 else:
-                    st.warning("No vanna matrix data available")
-                
-                # Add some spacing
-                st.markdown("---")
-                
-                # Charm Matrix Data Table
-                st.markdown("#### ⏰ Charm Matrix Data Table")
-                st.markdown("*Charm exposure by strikes (rows) vs expirations (columns) - Values in USD*")
-                
-                if results['charm_matrix'] is not None and not results['charm_matrix'].empty:
-                    # Apply same filtering logic as gamma matrix
-                    filtered_charm_matrix = results['charm_matrix'].loc[
-                        (results['charm_matrix'].index >= results['current_price'] - price_range) &
-                        (results['charm_matrix'].index <= results['current_price'] + price_range)
-                    ]
+                    st.info("No charm exposure data to display with current filters. Try adjusting the price range or enabling 'Show Zero Values'.")
                     
-                    # Apply column filtering (same relevant_columns as gamma matrix)
-                    if relevant_columns:
-                        # Make sure columns exist in charm matrix
-                        available_charm_columns = [col for col in relevant_columns if col in filtered_charm_matrix.columns]
-                        if available_charm_columns:
-                            filtered_charm_matrix = filtered_charm_matrix[available_charm_columns]
-                    
-                    if not show_zeros:
-                        # Remove rows and columns that are all zeros
-                        filtered_charm_matrix = filtered_charm_matrix.loc[~(filtered_charm_matrix == 0).all(axis=1)]
-                        filtered_charm_matrix = filtered_charm_matrix.loc[:, ~(filtered_charm_matrix == 0).all(axis=0)]
-                    
-                    # If "Show Only Key Levels" is selected, apply same filtering as gamma
-                    if highlight_only:
-                        if key_strikes:  # Use same key_strikes from gamma matrix
-                            available_strikes = [s for s in key_strikes if s in filtered_charm_matrix.index]
-                            if available_strikes:
-                                filtered_charm_matrix = filtered_charm_matrix.loc[available_strikes]
-                                filtered_charm_matrix = filtered_charm_matrix.sort_index(ascending=False)
-                    else:
-                        # Sort all data from highest to lowest strike
-                        filtered_charm_matrix = filtered_charm_matrix.sort_index(ascending=False)
-                    
-                    if not filtered_charm_matrix.empty:
-                        # Apply same styling as gamma matrix
-                        styled_charm_matrix = filtered_charm_matrix.style.apply(highlight_high_low, axis=None)
-                        styled_charm_matrix = styled_charm_matrix.format(format_gamma_values)
-                        
-                        st.dataframe(
-                            styled_charm_matrix,
-                            width='stretch',
-                            height=400
-                        )
-                        
-                        # Download button for charm matrix
-                        charm_csv = results['charm_matrix'].to_csv()
-                        st.download_button(
-                            label="📥 Download Charm Matrix CSV",
-                            data=charm_csv,
-                            file_name=f"{results['ticker']}_charm_matrix_{dt.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv"
-                        )
-                    else:
-                        st.info("No charm exposure data to display with current filters. Try adjusting the price range or enabling 'Show Zero Values'.")
-                        
-                else:
-                    st.warning("No charm matrix data available")
-                
             else:
-                st.warning("No gamma matrix data available")
+                st.warning("No charm matrix data available")
+            
+        else:
+            st.warning("No gamma matrix data available")
+    
+    with tab2:
+        st.subheader("🎯 Key Gamma Exposure Levels")
+        st.markdown("*Most important levels for trading decisions*")
         
-        with tab2:
-            st.subheader("🎯 Key Gamma Exposure Levels")
-            st.markdown("*Most important levels for trading decisions*")
-            
-            if results['key_levels'] is not None and not results['key_levels'].empty:
-                # Format key levels for display
-                display_levels = results['key_levels'].copy()
-                display_levels['gamma_exposure_formatted'] = display_levels['gamma_exposure'].apply(format_currency)
-                display_levels['distance_pct_formatted'] = display_levels['distance_pct'].apply(lambda x: f"{x:.1f}%")
-                display_levels['strike_formatted'] = display_levels['strike'].apply(lambda x: f"${x:.2f}")
-                
-                # Always use 'direction' column as we confirmed it exists
-                display_columns = [
-                    'level_type', 'strike_formatted', 'gamma_exposure_formatted', 
-                    'distance_pct_formatted', 'direction'
-                ]
-                column_names = {
-                    'level_type': 'Level Type',
-                    'strike_formatted': 'Strike Price',
-                    'gamma_exposure_formatted': 'Gamma Exposure',
-                    'distance_pct_formatted': 'Distance from Current',
-                    'direction': 'Direction'
-                }
-                
-                display_df = display_levels[display_columns].rename(columns=column_names)
-                
-                st.dataframe(
-                    display_df,
-                    width='stretch',
-                    hide_index=True,
-                    height=400
-                )
-                
-                # Highlight key insights
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("#### 📈 Nearest Resistance")
-                    resistance_levels = display_levels[display_levels['direction'] == 'Above'].head(3)
-                    if not resistance_levels.empty:
-                        for _, level in resistance_levels.iterrows():
-                            st.markdown(f"• **${level['strike']:.0f}** - {level['distance_pct']:.1f}% above")
-                    else:
-                        st.markdown("*No significant resistance levels found*")
+        if results['key_levels'] is not None and not results['key_levels'].empty:
+            # Format key levels for display (once per analysis run)
+            display_levels, display_df = build_key_levels_display(results, results['ticker'], results['timestamp'])
+            
+            st.dataframe(
+                display_df,
+                width='stretch',
+                hide_index=True,
+                height=400
+            )
+            
+            # Highlight key insights
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("#### 📈 Nearest Resistance")
+                resistance_levels = display_levels[display_levels['direction'] == 'Above'].head(3)
+                if not resistance_levels.empty:
+                    st.markdown("\n\n".join(
+                        f"• **${strike:.0f}** - {distance:.1f}% above"
+                        for strike, distance in zip(resistance_levels['strike'].to_numpy(), resistance_levels['distance_pct'].to_numpy())
+                    ))
+                else:
+                    st.markdown("*No significant resistance levels found*")
+            
+            with col2:
+                st.markdown("#### 📉 Nearest Support")
+                support_levels = display_levels[display_levels['direction'] == 'Below'].head(3)
+                if not support_levels.empty:
+                    st.markdown("\n\n".join(
+                        f"• **${strike:.0f}** - {distance:.1f}% below"
+                        for strike, distance in zip(support_levels['strike'].to_numpy(), support_levels['distance_pct'].to_numpy())
+                    ))
+                else:
+                    st.markdown("*No significant support levels found*")
+            
+            # Download button
+            csv = results_csv(results, results['ticker'], results['timestamp'], 'key_levels', index=False)
+            st.download_button(
+                label="📥 Download Key Levels CSV",
+                data=csv,
+                file_name=f"{results['ticker']}_key_levels_{run_ts_str}.csv",
+                mime="text/csv"
+            )
+            
+        else:
+            st.warning("No key levels data available")
+    
+    with tab3:
+        st.subheader("📈 Gamma Exposure Profile")
+        st.markdown("*Gamma exposure by strike price*")
+        
+        if results['gamma_by_strike'] is not None:
+            # Display interactive chart (figure spec built once per analysis run)
+            profile_json = profile_chart_json(results, results['ticker'], results['timestamp'])
+            if profile_json:
+                st.plotly_chart(json.loads(profile_json), width='stretch')
+            
+            # Summary statistics (same totals the sentiment analysis computed once for this run)
+            sentiment = results['sentiment']
+            positive_gamma = sentiment['total_positive_gamma']
+            negative_gamma = sentiment['total_negative_gamma']
+            net_gamma = sentiment['net_gamma']
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("Total Positive Gamma", format_currency(positive_gamma))
+            
+            with col2:
+                st.metric("Total Negative Gamma", format_currency(negative_gamma))
+            
+            with col3:
+                st.metric("Net Gamma", format_currency(net_gamma))
+    
+    with tab4:
+        st.subheader("📋 Analysis Summary")
+        
+        # Market sentiment details
+        if results['sentiment']:
+            st.markdown("#### 🎯 Market Sentiment Analysis")
+            
+            col1, col2 = st.columns(2)
+            
+            st.dataframe(
+                build_sentiment_summary(results, results['ticker'], results['timestamp']),
+                hide_index=True,
+                width='stretch'
+            )
+            
+            with col2:
+                st.markdown("#### 💡 Trading Implications")
                 
-                with col2:
-                    st.markdown("#### 📉 Nearest Support")
-                    support_levels = display_levels[display_levels['direction'] == 'Below'].head(3)
-                    if not support_levels.empty:
-                        for _, level in support_levels.iterrows():
-                            st.markdown(f"• **${level['strike']:.0f}** - {level['distance_pct']:.1f}% below")
-                    else:
-                        st.markdown("*No significant support levels found*")
+                regime = results['sentiment']['regime']
+                if "Positive" in regime:
+                    st.success("🟡 **Positive Gamma Environment**")
+                    st.markdown("""
+                    - Expect **lower volatility**
+                    - Price moves will be **dampened**
+                    - **Mean-reverting** behavior likely
+                    - Dealers provide liquidity **against** moves
+                    """)
+                elif "Negative" in regime:
+                    st.error("🟣 **Negative Gamma Environment**")
+                    st.markdown("""
+                    - Expect **higher volatility**
+                    - Price moves may be **amplified**
+                    - **Trending** behavior possible
+                    - Dealers may **accelerate** moves
+                    """)
+                else:
+                    st.info("⚪ **Mixed Gamma Environment**")
+                    st.markdown("""
+                    - **Moderate volatility** expected
+                    - Mixed price behavior
+                    - Monitor for regime changes
+                    """)
+            
+            # Gamma Flip Points Analysis
+            if 'gamma_flip_points' in results['sentiment'] and results['sentiment']['gamma_flip_points']:
+                st.markdown("#### ⚡ Gamma Flip Points Analysis")
                 
-                # Download button
-                csv = results['key_levels'].to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Key Levels CSV",
-                    data=csv,
-                    file_name=f"{results['ticker']}_key_levels_{dt.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+                flip_points = results['sentiment']['gamma_flip_points']
+                flip_strikes = results['sentiment']['gamma_flip_strikes']  # sorted ascending
+                current_price = results['current_price']
                 
-            else:
-                st.warning("No key levels data available")
-        
-        with tab3:
-            st.subheader("📈 Gamma Exposure Profile")
-            st.markdown("*Gamma exposure by strike price*")
-            
-            if results['gamma_by_strike'] is not None:
-                # Display interactive chart
-                profile_fig = create_gamma_profile_chart(
-                    results['gamma_by_strike'],
-                    results['current_price'],
-                    results['ticker']
-                )
-                if profile_fig:
-                    st.plotly_chart(profile_fig, width='stretch')
-                
-                # Summary statistics
+                # Count and basic stats
                 col1, col2, col3 = st.columns(3)
-                
                 with col1:
-                    positive_gamma = results['gamma_by_strike'][results['gamma_by_strike']['gamma_exposure'] > 0]['gamma_exposure'].sum()
-                    st.metric("Total Positive Gamma", format_currency(positive_gamma))
-                
-                with col2:
-                    negative_gamma = results['gamma_by_strike'][results['gamma_by_strike']['gamma_exposure'] < 0]['gamma_exposure'].sum()
-                    st.metric("Total Negative Gamma", format_currency(negative_gamma))
-                
-                with col3:
-                    net_gamma = positive_gamma + negative_gamma
-                    st.metric("Net Gamma", format_currency(net_gamma))
-        
-        with tab4:
-            st.subheader("📋 Analysis Summary")
-            
-            # Market sentiment details
-            if results['sentiment']:
-                st.markdown("#### 🎯 Market Sentiment Analysis")
+                    st.metric(
+                        label="Total Flip Points",
+                        value=len(flip_points)
+                    )
                 
-                col1, col2 = st.columns(2)
+                # Find nearest flip points strictly below and above current price
+                below_idx = np.searchsorted(flip_strikes, current_price, side='left')
+                above_idx = np.searchsorted(flip_strikes, current_price, side='right')
                 
-                with col1:
-                    sentiment_data = {
-                        'Metric': [
-                            'Market Regime',
-                            'Net Gamma Exposure',
-                            'Total Positive Gamma',
-                            'Total Negative Gamma',
-                            'Near Money Gamma'
-                        ],
-                        'Value': [
-                            results['sentiment']['regime'],
-                            format_currency(results['sentiment']['net_gamma']),
-                            format_currency(results['sentiment']['total_positive_gamma']),
-                            format_currency(results['sentiment']['total_negative_gamma']),
-                            format_currency(results['sentiment']['near_money_gamma'])
-                        ]
-                    }
-                    
-                st.dataframe(
-                    pd.DataFrame(sentiment_data),
-                    hide_index=True,
-                    width='stretch'
-                )
+                nearest_below = flip_strikes[below_idx - 1] if below_idx > 0 else None
+                nearest_above = flip_strikes[above_idx] if above_idx < len(flip_strikes) else None
                 
                 with col2:
-                    st.markdown("#### 💡 Trading Implications")
-                    
-                    regime = results['sentiment']['regime']
-                    if "Positive" in regime:
-                        st.success("🟡 **Positive Gamma Environment**")
-                        st.markdown("""
-                        - Expect **lower volatility**
-                        - Price moves will be **dampened**
-                        - **Mean-reverting** behavior likely
-                        - Dealers provide liquidity **against** moves
-                        """)
-                    elif "Negative" in regime:
-                        st.error("🟣 **Negative Gamma Environment**")
-                        st.markdown("""
-                        - Expect **higher volatility**
-                        - Price moves may be **amplified**
-                        - **Trending** behavior possible
-                        - Dealers may **accelerate** moves
-                        """)
+                    if nearest_below is not None:
+                        distance_below = (current_price - nearest_below) / current_price * 100
+                        st.metric(
+                            label="Nearest Support Flip",
+                            value=f"${nearest_below:.0f}",
+                            delta=f"-{distance_below:.1f}%"
+                        )
                     else:
-                        st.info("⚪ **Mixed Gamma Environment**")
-                        st.markdown("""
-                        - **Moderate volatility** expected
-                        - Mixed price behavior
-                        - Monitor for regime changes
-                        """)
+                        st.metric(label="Nearest Support Flip", value="None")
                 
-                # Gamma Flip Points Analysis
-                if 'gamma_flip_points' in results['sentiment'] and results['sentiment']['gamma_flip_points']:
-                    st.markdown("#### ⚡ Gamma Flip Points Analysis")
-                    
-                    flip_points = results['sentiment']['gamma_flip_points']
-                    current_price = results['current_price']
-                    
-                    # Count and basic stats
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
+                with col3:
+                    if nearest_above is not None:
+                        distance_above = (nearest_above - current_price) / current_price * 100
                         st.metric(
-                            label="Total Flip Points",
-                            value=len(flip_points)
+                            label="Nearest Resistance Flip",
+                            value=f"${nearest_above:.0f}",
+                            delta=f"+{distance_above:.1f}%"
                         )
-                    
-                    # Find nearest flip points above and below current price
-                    below_current = [fp for fp in flip_points if fp['strike'] < current_price]
-                    above_current = [fp for fp in flip_points if fp['strike'] > current_price]
-                    
-                    nearest_below = max(below_current, key=lambda x: x['strike']) if below_current else None
-                    nearest_above = min(above_current, key=lambda x: x['strike']) if above_current else None
-                    
-                    with col2:
-                        if nearest_below:
-                            distance_below = (current_price - nearest_below['strike']) / current_price * 100
-                            st.metric(
-                                label="Nearest Support Flip",
-                                value=f"${nearest_below['strike']:.0f}",
-                                delta=f"-{distance_below:.1f}%"
-                            )
-                        else:
-                            st.metric(label="Nearest Support Flip", value="None")
-                    
-                    with col3:
-                        if nearest_above:
-                            distance_above = (nearest_above['strike'] - current_price) / current_price * 100
-                            st.metric(
-                                label="Nearest Resistance Flip",
-                                value=f"${nearest_above['strike']:.0f}",
-                                delta=f"+{distance_above:.1f}%"
-                            )
-                        else:
-                            st.metric(label="Nearest Resistance Flip", value="None")
-                    
-                    # Key flip points near current price
-                    nearby_flips = [fp for fp in flip_points 
-                                  if abs(fp['strike'] - current_price) / current_price <= 0.15]  # Within 15%
-                    
-                    if nearby_flips:
-                        st.markdown("**🎯 Key Flip Points Near Current Price (±15%):**")
-                        flip_df = pd.DataFrame([
-                            {
-                                'Strike Price': f"${fp['strike']:.0f}",
-                                'Distance': f"{((fp['strike'] - current_price) / current_price * 100):+.1f}%",
-                                'Position': 'Above' if fp['strike'] > current_price else 'Below'
-                            }
-                            for fp in sorted(nearby_flips, key=lambda x: abs(x['strike'] - current_price))[:10]
-                        ])
-                        st.dataframe(flip_df, hide_index=True, width='stretch')
-                    
-                    # Trading implications
-                    st.markdown("**📊 Flip Points Trading Implications:**")
-                    if len(flip_points) > 30:
-                        st.warning("⚠️ **High Flip Point Density** - Complex gamma environment with many volatility shift zones")
-                    elif len(flip_points) > 15:
-                        st.info("📈 **Moderate Flip Point Activity** - Several key levels to monitor")
                     else:
-                        st.success("✅ **Clean Gamma Structure** - Few but important flip points")
-                    
-                    st.markdown("""
-                    - **Flip Points** = Price levels where gamma exposure changes sign
-                    - **Support Flips** = Levels below current price where volatility behavior shifts
-                    - **Resistance Flips** = Levels above current price with potential volatility changes
-                    - **Near Price Flips** = Most relevant for short-term trading decisions
-                    """)
-            
-            # Dealer positioning
-            if results['positioning']:
-                st.markdown("#### 🏦 Dealer Positioning")
+                        st.metric(label="Nearest Resistance Flip", value="None")
                 
-                positioning_data = {
-                    'Metric': [
-                        'Call Gamma Exposure',
-                        'Put Gamma Exposure',
-                        'ATM Call Gamma',
-                        'ATM Put Gamma',
-                        'Put/Call Gamma Ratio'
-                    ],
-                    'Value': [
-                        format_currency(results['positioning']['call_gamma_exposure']),
-                        format_currency(results['positioning']['put_gamma_exposure']),
-                        format_currency(results['positioning']['atm_call_gamma']),
-                        format_currency(results['positioning']['atm_put_gamma']),
-                        f"{results['positioning']['pc_ratio_gamma']:.2f}"
-                    ]
-                }
+                # Key flip points near current price (within 15%)
+                if (np.abs(flip_strikes - current_price) / current_price <= 0.15).any():
+                    st.markdown("**🎯 Key Flip Points Near Current Price (±15%):**")
+                    flip_df = build_flip_table(results, results['ticker'], results['timestamp'])
+                    st.dataframe(flip_df, hide_index=True, width='stretch')
                 
-                st.dataframe(
-                    pd.DataFrame(positioning_data),
-                    hide_index=True,
-                    width='stretch'
-                )
+                # Trading implications
+                st.markdown("**📊 Flip Points Trading Implications:**")
+                if len(flip_points) > 30:
+                    st.warning("⚠️ **High Flip Point Density** - Complex gamma environment with many volatility shift zones")
+                elif len(flip_points) > 15:
+                    st.info("📈 **Moderate Flip Point Activity** - Several key levels to monitor")
+                else:
+                    st.success("✅ **Clean Gamma Structure** - Few but important flip points")
+                
+                st.markdown("""
+                - **Flip Points** = Price levels where gamma exposure changes sign
+                - **Support Flips** = Levels below current price where volatility behavior shifts
+                - **Resistance Flips** = Levels above current price with potential volatility changes
+                - **Near Price Flips** = Most relevant for short-term trading decisions
+                """)
+        
+        # Dealer positioning
+        if results['positioning']:
+            st.markdown("#### 🏦 Dealer Positioning")
             
-            # Analysis timestamp
-            st.markdown(f"*Analysis completed at: {results['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}*")
-    
+            st.dataframe(
+                build_positioning_summary(results, results['ticker'], results['timestamp']),
+                hide_index=True,
+                width='stretch'
+            )
+        
+        # Analysis timestamp
+        st.markdown(f"*Analysis completed at: {results['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}*")
+
     # Footer
     st.markdown("---")
     st.markdown("""
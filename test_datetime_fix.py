@@ -51,14 +51,10 @@ def test_column_filtering():
         current_date = dt.now()
         three_months_out = current_date + timedelta(days=90)
         
-        relevant_columns = []
-        for col in sample_columns:
-            try:
-                col_date = dt.strptime(str(col), '%Y-%m-%d')
-                if col_date <= three_months_out:
-                    relevant_columns.append(col)
-            except (ValueError, TypeError):
-                relevant_columns.append(col)
+        # Parse all columns at once (same approach as the dashboard); unparseable columns are kept
+        columns = pd.Index(sample_columns)
+        parsed = pd.to_datetime(columns, format='%Y-%m-%d', errors='coerce')
+        relevant_columns = columns[parsed.isna() | (parsed <= three_months_out)].tolist()
         
         print(f"✅ Filtered columns (3 months): {relevant_columns}")
         print(f"✅ Filtered {len(sample_columns)} -> {len(relevant_columns)} columns")
@@ -4,8 +4,43 @@ Simple test script for Gamma Exposure Analysis Tool
 Run this to verify installation and basic functionality
 """
 
+import io
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+_shared_analyzer = None
+_shared_analyzer_lock = threading.Lock()
+
+def get_shared_analyzer():
+    """SPY analyzer with options data and gamma exposure fetched once and shared across tests"""
+    global _shared_analyzer
+    with _shared_analyzer_lock:
+        if _shared_analyzer is None:
+            from gamma_exposure_analyzer import GammaExposureAnalyzer
+            
+            analyzer = GammaExposureAnalyzer("SPY")
+            analyzer.get_current_price()
+            
+            print("📈 Fetching SPY options data (this may take a moment)...")
+            analyzer.get_options_data()
+            analyzer.calculate_gamma_exposure()
+            _shared_analyzer = analyzer
+    return _shared_analyzer
+
+class ThreadBufferedStdout:
+    """sys.stdout replacement that sends each thread's prints to that thread's buffer, if it set one"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
 
 def test_imports():
     """Test all required imports"""
@@ -70,22 +105,16 @@ def test_options_data():
     print("\n🧪 Testing options data retrieval...")
     
     try:
-        from gamma_exposure_analyzer import GammaExposureAnalyzer
-        
-        analyzer = GammaExposureAnalyzer("SPY")
-        analyzer.get_current_price()
-        
-        # Get limited options data for testing
-        print("📈 Fetching SPY options data (this may take a moment)...")
-        options_data = analyzer.get_options_data()
+        analyzer = get_shared_analyzer()
+        options_data = analyzer.options_data
         
         if options_data and len(options_data) > 0:
-            total_options = sum(len(df) for df in options_data.values())
+            total_options = analyzer.total_options()
             print(f"✅ Retrieved {len(options_data)} expiration dates with {total_options} total options")
             
-            # Test gamma calculation on subset
+            # Gamma exposure is calculated once on the shared analyzer
             print("🧮 Testing gamma exposure calculation...")
-            gamma_data = analyzer.calculate_gamma_exposure()
+            gamma_data = analyzer.gamma_exposure_data
             
             if gamma_data is not None and len(gamma_data) > 0:
                 print(f"✅ Calculated gamma exposure for {len(gamma_data)} options")
@@ -107,13 +136,9 @@ def test_advanced_features():
     print("\n🧪 Testing advanced features...")
     
     try:
-        from gamma_exposure_analyzer import GammaExposureAnalyzer
         from advanced_analysis import AdvancedGammaAnalysis
         
-        analyzer = GammaExposureAnalyzer("SPY")
-        analyzer.get_current_price()
-        analyzer.get_options_data()
-        analyzer.calculate_gamma_exposure()
+        analyzer = get_shared_analyzer()
         
         advanced = AdvancedGammaAnalysis(analyzer)
         
@@ -178,8 +203,13 @@ def main():
     print("🔥 Gamma Exposure Analysis Tool - Test Suite")
     print("=" * 60)
     
-    tests = [
-        ("Import Test", test_imports),
+    # Imports must succeed before anything else runs; the remaining tests are
+    # network bound, so they run concurrently with their output buffered and
+    # printed in their listed order
+    serial_tests = [
+        ("Import Test", test_imports)
+    ]
+    parallel_tests = [
         ("Basic Functionality", test_basic_functionality),
         ("Options Data", test_options_data),
         ("Advanced Features", test_advanced_features),
@@ -187,21 +217,40 @@ def main():
     ]
     
     passed = 0
-    total = len(tests)
+    total = len(serial_tests) + len(parallel_tests)
     
-    for test_name, test_func in tests:
+    def report(test_name, run):
         print(f"\n{'='*20} {test_name} {'='*20}")
         try:
-            if test_func():
-                passed += 1
+            if run():
                 print(f"✅ {test_name} PASSED")
-            else:
-                print(f"❌ {test_name} FAILED")
-        except KeyboardInterrupt:
-            print(f"\n⚠️ Test interrupted by user")
-            break
+                return True
+            print(f"❌ {test_name} FAILED")
         except Exception as e:
             print(f"❌ {test_name} FAILED with exception: {e}")
+        return False
+    
+    def report_buffered(test_name, test_func):
+        """report() on a worker thread, returning (passed, printed output)"""
+        buffer = sys.stdout.local.buffer = io.StringIO()
+        return report(test_name, test_func), buffer.getvalue()
+    
+    try:
+        for test_name, test_func in serial_tests:
+            passed += report(test_name, test_func)
+        
+        sys.stdout = ThreadBufferedStdout(sys.stdout)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(report_buffered, test_name, test_func)
+                       for test_name, test_func in parallel_tests]
+            for future in futures:
+                test_passed, output = future.result()
+                print(output, end='')
+                passed += test_passed
+    except KeyboardInterrupt:
+        print(f"\n⚠️ Test interrupted by user")
+    finally:
+        sys.stdout = getattr(sys.stdout, 'stream', sys.stdout)
     
     print(f"\n{'='*60}")
     print(f"📊 Test Results: {passed}/{total} tests passed")